@@ -1,7 +1,8 @@
 #!/usr/bin/python3
 """ Flask Application """
-from models import storage
+from models import async_storage, storage
 from api.v1.views import app_views
+from api.v1.views.async_views import async_views
 from os import environ
 from flask import Flask, render_template, make_response, jsonify
 from flask_cors import CORS
@@ -10,6 +11,9 @@ from flasgger.utils import swag_from
 
 my_App = Flask(__name__)
 my_App.config['JSONIFY_PRETTYPRINT_REGULAR'] = True
+if async_storage is not None:
+    # registered first, the async views take over the routes they serve
+    my_App.register_blueprint(async_views)
 my_App.register_blueprint(app_views)
 cors = CORS(my_App, resources={r"/*": {"origins": "0.0.0.0"}})
 
@@ -0,0 +1,130 @@
+#!/usr/bin/python3
+"""
+ASGI entry point of the API: the async views run on the event loop of the
+server, so that a single worker has as many requests in flight as there
+are waiting on the database, and asgiref's WsgiToAsgi serves the others
+
+Serve with HBNB_ASYNC=1 HBNB_ASYNC_POOL=1 uvicorn api.v1.asgi:asgi_app;
+needs flask[async], sqlalchemy[asyncio] and aiomysql or aiosqlite
+"""
+from api.v1.app import my_App
+from asgiref.wsgi import WsgiToAsgi
+from flask import request
+import inspect
+import io
+import sys
+
+wsgi_app = WsgiToAsgi(my_App)
+
+
+async def read_body(receive):
+    """returns the body of the request, None if the client went away"""
+    body = b""
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return None
+        body += message.get("body", b"")
+        if not message.get("more_body", False):
+            return body
+
+
+def build_environ(scope, body):
+    """returns the WSGI environ of the request of scope, whose body is
+    body"""
+    path = scope["path"]
+    root_path = scope.get("root_path", "")
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+    server = scope.get("server") or ("localhost", 80)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": root_path.encode("utf8").decode("latin1"),
+        "PATH_INFO": path.encode("utf8").decode("latin1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1] or 80),
+        "SERVER_PROTOCOL": "HTTP/" + scope.get("http_version", "1.1"),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+        "hbnb.async_body": True,
+    }
+    if scope.get("client"):
+        environ["REMOTE_ADDR"] = scope["client"][0]
+    for name, value in scope.get("headers", []):
+        name = name.decode("latin1").upper().replace("-", "_")
+        if name not in ("CONTENT_LENGTH", "CONTENT_TYPE"):
+            name = "HTTP_" + name
+        value = value.decode("latin1")
+        if name in environ:
+            value = environ[name] + "," + value
+        environ[name] = value
+    return environ
+
+
+async def dispatch(app, view):
+    """
+    Runs the async view of the current request on the running event loop,
+    and returns its response, the way Flask.full_dispatch_request() runs a
+    view in a thread
+    """
+    try:
+        rv = app.preprocess_request()
+        if rv is None:
+            rv = await view(**request.view_args)
+    except Exception as e:
+        try:
+            rv = app.handle_user_exception(e)
+        except Exception as e:
+            return app.handle_exception(e)
+    return app.finalize_request(rv)
+
+
+async def send_response(send, response):
+    """Sends response, whose body may be an async iterator of bytes"""
+    headers = [(name.lower().encode("latin1"), value.encode("latin1"))
+               for name, value in response.headers.items()]
+    await send({"type": "http.response.start",
+                "status": response.status_code, "headers": headers})
+    if hasattr(response.response, "__aiter__"):
+        try:
+            async for chunk in response.response:
+                await send({"type": "http.response.body",
+                            "body": chunk, "more_body": True})
+        finally:
+            await response.response.aclose()
+        await send({"type": "http.response.body", "body": b""})
+    else:
+        await send({"type": "http.response.body",
+                    "body": response.get_data()})
+    response.close()
+
+
+async def asgi_app(scope, receive, send):
+    """The API as an ASGI application"""
+    if scope["type"] == "lifespan":
+        while (await receive())["type"] != "lifespan.shutdown":
+            await send({"type": "lifespan.startup.complete"})
+        await send({"type": "lifespan.shutdown.complete"})
+        return
+    if scope["type"] == "http":
+        body = await read_body(receive)
+        if body is None:
+            return
+        with my_App.request_context(build_environ(scope, body)):
+            rule = request.url_rule
+            view = my_App.view_functions.get(rule.endpoint) if rule else None
+            if inspect.iscoroutinefunction(view):
+                await send_response(send, await dispatch(my_App, view))
+                return
+
+        async def replay():
+            """the body already read, in one message"""
+            return {"type": "http.request", "body": body}
+        receive = replay
+    await wsgi_app(scope, receive, send)
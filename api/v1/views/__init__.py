@@ -1,9 +1,119 @@
 #!/usr/bin/python3
 """ A Blueprint for the API """
-from flask import Blueprint
+from flask import abort, Blueprint, current_app, jsonify, make_response
+from flask import request, stream_with_context
+from itertools import islice
+from models import storage
+from os import getenv
+from urllib.parse import urlencode
 
 app_views = Blueprint('app_views', __name__, url_prefix='/api/v1')
 
+
+def joinable():
+    """
+    Returns whether the app writes JSON like to_json() does, so that the
+    JSON bytes of objects can be joined into a response
+    """
+    provider = current_app.json
+    return not (provider.compact is None and current_app.debug or
+                provider.compact is False or
+                getattr(provider, "sort_keys", None) is not True or
+                getattr(provider, "ensure_ascii", None) is not True)
+
+
+def jsonify_objects(objs):
+    """
+    Returns the JSON response of the list of the to_dict() of objs,
+    joining the JSON bytes each object keeps between requests
+    """
+    if not joinable():
+        return jsonify([obj.to_dict() for obj in objs])
+    body = b"[" + b",".join([obj.to_json() for obj in objs]) + b"]\n"
+    return current_app.response_class(body, mimetype=current_app.json.mimetype)
+
+
+def stream_objects(objs, batch_size=1000):
+    """
+    Returns the JSON response of the list of the to_dict() of objs, an
+    iterator, sent batch_size objects at a time as they come, so that the
+    list is never held in memory
+    """
+    if not joinable():
+        return jsonify([obj.to_dict() for obj in objs])
+    objs = iter(objs)
+
+    def chunks():
+        """yields the JSON of the list, batch_size objects at a time"""
+        sep = b"["
+        while True:
+            batch = list(islice(objs, batch_size))
+            if not batch:
+                break
+            yield sep + b",".join([obj.to_json() for obj in batch])
+            sep = b","
+        yield b"]\n" if sep == b"," else b"[]\n"
+    return current_app.response_class(stream_with_context(chunks()),
+                                      mimetype=current_app.json.mimetype)
+
+
+def page_args():
+    """
+    Returns the limit and after of the query string of the request: the
+    page holds the first limit objects whose id comes after after, limit
+    defaulting to HBNB_API_PAGE_SIZE, if set
+    """
+    limit = request.args.get('limit', getenv('HBNB_API_PAGE_SIZE'))
+    if limit is not None:
+        if not limit.isdigit() or not int(limit):
+            abort(400, description="Invalid limit")
+        limit = int(limit)
+    return limit, request.args.get('after')
+
+
+def jsonify_page(objs, limit):
+    """
+    Returns jsonify_objects(objs) with a Link header to the next page when
+    objs fills a page of limit objects
+    """
+    objs = list(objs)
+    response = jsonify_objects(objs)
+    if limit is not None and len(objs) == limit:
+        args = request.args.to_dict()
+        args.update(limit=limit, after=objs[-1].id)
+        response.headers['Link'] = '<{}?{}>; rel="next"'.format(
+            request.base_url, urlencode(args))
+    return response
+
+
+def save_new(objs, many):
+    """
+    Saves the new objects objs and returns the 201 response of their list,
+    or of the only one of them unless many, the body of the request being
+    a list of objects or a single one
+    """
+    if not many:
+        objs[0].save()
+        return make_response(jsonify(objs[0].to_dict()), 201)
+    storage.bulk_new(objs)
+    response = jsonify_objects(objs)
+    response.status_code = 201
+    return response
+
+
+def json_items():
+    """
+    Returns the objects of the JSON body of the request, which is a single
+    object or a list of them, and whether it is a list
+    """
+    data = request.get_json()
+    many = isinstance(data, list)
+    items = data if many else [data]
+    if not data or not all(isinstance(item, dict) and item
+                           for item in items):
+        abort(400, description="Not a JSON")
+    return items, many
+
 from api.v1.views.index import *
 from api.v1.views.states import *
 from api.v1.views.places import *
@@ -2,7 +2,8 @@
 """ objects that handles all default RestFul API actions for Amenities"""
 from models.amenity import Amenity
 from models import storage
-from api.v1.views import app_views
+from api.v1.views import app_views, json_items, jsonify_page, page_args
+from api.v1.views import save_new
 from flask import abort, jsonify, make_response, request
 from flasgger.utils import swag_from
 
@@ -13,11 +14,9 @@ def get_amenities():
     """
     Retrieves a list of all amenities
     """
-    all_amenities = storage.all(Amenity).values()
-    list_amenities = []
-    for amenity in all_amenities:
-        list_amenities.append(amenity.to_dict())
-    return jsonify(list_amenities)
+    limit, after = page_args()
+    all_amenities = storage.all(Amenity, limit=limit, after=after).values()
+    return jsonify_page(all_amenities, limit)
 
 
 @app_views.route('/amenities/<amenity_id>/', methods=['GET'],
@@ -55,18 +54,14 @@ def delete_amenity(amenity_id):
 @swag_from('documentation/amenity/post_amenity.yml', methods=['POST'])
 def post_amenity():
     """
-    Creates an amenity
+    Creates an amenity, or every amenity of a list
     """
-    if not request.get_json():
-        abort(400, description="Not a JSON")
+    items, many = json_items()
 
-    if 'name' not in request.get_json():
+    if not all('name' in data for data in items):
         abort(400, description="Missing name")
 
-    data = request.get_json()
-    instance = Amenity(**data)
-    instance.save()
-    return make_response(jsonify(instance.to_dict()), 201)
+    return save_new([Amenity(**data) for data in items], many)
 
 
 @app_views.route('/amenities/<amenity_id>', methods=['PUT'],
@@ -87,8 +82,11 @@ def put_amenity(amenity_id):
         abort(404)
 
     data = request.get_json()
+    changed = False
     for key, value in data.items():
-        if key not in ignore:
+        if key not in ignore and getattr(amenity, key, None) != value:
             setattr(amenity, key, value)
-    storage.save()
+            changed = True
+    if changed:
+        storage.save()
     return make_response(jsonify(amenity.to_dict()), 200)
@@ -0,0 +1,185 @@
+#!/usr/bin/python3
+"""
+async versions of the hot RestFul API actions, reading from
+models.async_storage; app.py registers them ahead of app_views when
+HBNB_ASYNC=1, the other methods of their routes staying with app_views
+"""
+from models.state import State
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.user import User
+from models.amenity import Amenity
+import models
+from api.v1.views import joinable, jsonify_objects, jsonify_page, page_args
+from api.v1.views.places import city_places, search_filters, with_amenities
+from flask import abort, Blueprint, current_app, jsonify, request
+import functools
+
+async_views = Blueprint('async_views', __name__, url_prefix='/api/v1')
+
+
+def closing(view):
+    """closes the session of the request once the async view is done"""
+    @functools.wraps(view)
+    async def wrapper(*args, **kwargs):
+        """runs the view, then closes the session"""
+        try:
+            return await view(*args, **kwargs)
+        finally:
+            await models.async_storage.close()
+    return wrapper
+
+
+@async_views.route('/stats', methods=['GET'], strict_slashes=False)
+@closing
+async def number_objects():
+    """ Retrieves the number of each objects by type """
+    classes = [Amenity, City, Place, Review, State, User]
+    names = ["amenities", "cities", "places", "reviews", "states", "users"]
+
+    counts = await models.async_storage.counts(classes)
+    nm_objs = {}
+    for ix in range(len(classes)):
+        nm_objs[names[ix]] = counts[classes[ix].__name__]
+
+    return jsonify(nm_objs)
+
+
+async def stream_objects(objs, batch_size=1000):
+    """
+    Returns the JSON response of the list of the to_dict() of objs, an
+    async iterator, sent batch_size objects at a time as they come when
+    api/v1/asgi.py serves the request, which sends async response bodies;
+    the session of the request is closed once the list is sent
+    """
+    if not joinable() or not request.environ.get("hbnb.async_body"):
+        return jsonify_objects([obj async for obj in objs])
+
+    async def chunks():
+        """yields the JSON of the list, batch_size objects at a time"""
+        try:
+            sep = b"["
+            batch = []
+            async for obj in objs:
+                batch.append(obj.to_json())
+                if len(batch) == batch_size:
+                    yield sep + b",".join(batch)
+                    sep = b","
+                    batch = []
+            if batch:
+                yield sep + b",".join(batch)
+                sep = b","
+            yield b"]\n" if sep == b"," else b"[]\n"
+        finally:
+            await models.async_storage.close()
+    return current_app.response_class(chunks(),
+                                      mimetype=current_app.json.mimetype)
+
+
+async def get_all(cls):
+    """ Retrieves a page of the objects of cls """
+    limit, after = page_args()
+    objs = await models.async_storage.all(cls, limit=limit, after=after)
+    return jsonify_page(objs.values(), limit)
+
+
+async def get_one(cls, id):
+    """ Retrieves the object of cls with the ID id """
+    obj = await models.async_storage.get(cls, id)
+    if not obj:
+        abort(404)
+    return jsonify(obj.to_dict())
+
+
+async def get_children(parent, parent_id, cls, attr):
+    """ Retrieves a page of the objects of cls whose attr is parent_id """
+    if not await models.async_storage.get(parent, parent_id):
+        abort(404)
+    limit, after = page_args()
+    objs = await models.async_storage.find(cls, attr, parent_id,
+                                           limit=limit, after=after)
+    return jsonify_page(objs, limit)
+
+
+@async_views.route('/states', methods=['GET'], strict_slashes=False)
+@closing
+async def get_states():
+    """ Retrieves the list of all State objects """
+    return await get_all(State)
+
+
+@async_views.route('/states/<state_id>', methods=['GET'],
+                   strict_slashes=False)
+@closing
+async def get_state(state_id):
+    """ Retrieves a specific State """
+    return await get_one(State, state_id)
+
+
+@async_views.route('/amenities', methods=['GET'], strict_slashes=False)
+@closing
+async def get_amenities():
+    """ Retrieves a list of all amenities """
+    return await get_all(Amenity)
+
+
+@async_views.route('/users', methods=['GET'], strict_slashes=False)
+@closing
+async def get_users():
+    """ Retrieves the list of all user objects """
+    return await get_all(User)
+
+
+@async_views.route('/states/<state_id>/cities', methods=['GET'],
+                   strict_slashes=False)
+@closing
+async def get_cities(state_id):
+    """ Retrieves the list of all cities objects of a specific State """
+    return await get_children(State, state_id, City, "state_id")
+
+
+@async_views.route('/cities/<city_id>/places', methods=['GET'],
+                   strict_slashes=False)
+@closing
+async def get_places(city_id):
+    """ Retrieves the list of all Place objects of a City """
+    return await get_children(City, city_id, Place, "city_id")
+
+
+@async_views.route('/places/<place_id>/reviews', methods=['GET'],
+                   strict_slashes=False)
+@closing
+async def get_reviews(place_id):
+    """ Retrieves the list of all Review objects of a Place """
+    return await get_children(Place, place_id, Review, "place_id")
+
+
+@async_views.route('/places_search', methods=['POST'], strict_slashes=False)
+@closing
+async def places_search():
+    """
+    Retrieves all Place objects depending of the JSON in the body
+    of the request, like places.places_search()
+    """
+    states, cities, amenities = search_filters()
+    storage = models.async_storage
+    if not states and not cities and not amenities:
+        return await stream_objects(storage.iter(Place))
+
+    # the relationships walked, loaded along with the objects
+    places = "places.amenities" if amenities else "places"
+    list_places = city_places(
+        [await storage.get(State, s_id, load=["cities." + places])
+         for s_id in states],
+        [await storage.get(City, c_id, load=[places]) for c_id in cities])
+
+    if amenities:
+        if not list_places:
+            list_places = (await storage.all(
+                Place, load=["amenities"])).values()
+        list_places = with_amenities(
+            list_places,
+            [await storage.get(Amenity, a_id) for a_id in amenities])
+
+    return jsonify_objects(list_places)
@@ -3,7 +3,8 @@
 from models.city import City
 from models.state import State
 from models import storage
-from api.v1.views import app_views
+from api.v1.views import app_views, json_items, jsonify_page, page_args
+from api.v1.views import save_new
 from flask import abort, jsonify, make_response, request
 from flasgger.utils import swag_from
 
@@ -16,14 +17,13 @@ def get_cities(state_id):
     Retrieves the list of all cities objects
     of a specific State, or a specific city
     """
-    list_cities = []
     state = storage.get(State, state_id)
     if not state:
         abort(404)
-    for city in state.cities:
-        list_cities.append(city.to_dict())
 
-    return jsonify(list_cities)
+    limit, after = page_args()
+    return jsonify_page(storage.find(City, "state_id", state.id,
+                                     limit=limit, after=after), limit)
 
 
 @app_views.route('/cities/<city_id>/', methods=['GET'], strict_slashes=False)
@@ -59,21 +59,21 @@ def delete_city(city_id):
 @swag_from('documentation/city/post_city.yml', methods=['POST'])
 def post_city(state_id):
     """
-    Creates a City
+    Creates a City, or every City of a list
     """
     state = storage.get(State, state_id)
     if not state:
         abort(404)
-    if not request.get_json():
-        abort(400, description="Not a JSON")
-    if 'name' not in request.get_json():
+    items, many = json_items()
+    if not all('name' in data for data in items):
         abort(400, description="Missing name")
 
-    data = request.get_json()
-    instance = City(**data)
-    instance.state_id = state.id
-    instance.save()
-    return make_response(jsonify(instance.to_dict()), 201)
+    instances = []
+    for data in items:
+        instance = City(**data)
+        instance.state_id = state.id
+        instances.append(instance)
+    return save_new(instances, many)
 
 
 @app_views.route('/cities/<city_id>', methods=['PUT'], strict_slashes=False)
@@ -92,8 +92,11 @@ def put_city(city_id):
     ignore = ['id', 'state_id', 'created_at', 'updated_at']
 
     data = request.get_json()
+    changed = False
     for key, value in data.items():
-        if key not in ignore:
+        if key not in ignore and getattr(city, key, None) != value:
             setattr(city, key, value)
-    storage.save()
+            changed = True
+    if changed:
+        storage.save()
     return make_response(jsonify(city.to_dict()), 200)
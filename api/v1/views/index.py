@@ -6,9 +6,9 @@ from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
-from models import storage
+from models import storage, storage_t
 from api.v1.views import app_views
-from flask import jsonify
+from flask import abort, jsonify
 
 
 @app_views.route('/status', methods=['GET'], strict_slashes=False)
@@ -23,8 +23,17 @@ def number_objects():
     classes = [Amenity, City, Place, Review, State, User]
     names = ["amenities", "cities", "places", "reviews", "states", "users"]
 
+    counts = storage.counts(classes)
     nm_objs = {}
     for ix in range(len(classes)):
-        nm_objs[names[ix]] = storage.count(classes[ix])
+        nm_objs[names[ix]] = counts[classes[ix].__name__]
 
     return jsonify(nm_objs)
+
+
+@app_views.route('/stats/pool', methods=['GET'], strict_slashes=False)
+def pool_stats():
+    """ Retrieves the state of the database connection pool """
+    if storage_t != "db":
+        abort(404)
+    return jsonify(storage.pool_stats())
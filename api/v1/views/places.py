@@ -6,7 +6,8 @@ from models.place import Place
 from models.user import User
 from models.amenity import Amenity
 from models import storage
-from api.v1.views import app_views
+from api.v1.views import app_views, json_items, jsonify_objects, save_new
+from api.v1.views import jsonify_page, page_args, stream_objects
 from flask import abort, jsonify, make_response, request
 from flasgger.utils import swag_from
 
@@ -23,9 +24,9 @@ def get_places(city_id):
     if not city:
         abort(404)
 
-    places = [place.to_dict() for place in city.places]
-
-    return jsonify(places)
+    limit, after = page_args()
+    return jsonify_page(storage.find(Place, "city_id", city.id,
+                                     limit=limit, after=after), limit)
 
 
 @app_views.route('/places/<place_id>', methods=['GET'], strict_slashes=False)
@@ -65,32 +66,29 @@ def delete_place(place_id):
 @swag_from('documentation/place/post_place.yml', methods=['POST'])
 def post_place(city_id):
     """
-    Creates a Place
+    Creates a Place, or every Place of a list
     """
     city = storage.get(City, city_id)
 
     if not city:
         abort(404)
 
-    if not request.get_json():
-        abort(400, description="Not a JSON")
+    items, many = json_items()
 
-    if 'user_id' not in request.get_json():
+    if not all('user_id' in data for data in items):
         abort(400, description="Missing user_id")
 
-    data = request.get_json()
-    user = storage.get(User, data['user_id'])
-
-    if not user:
+    users = [data['user_id'] for data in items]
+    if not all(type(user_id) is str for user_id in users) or \
+       not all(storage.get(User, user_id) for user_id in set(users)):
         abort(404)
 
-    if 'name' not in request.get_json():
+    if not all('name' in data for data in items):
         abort(400, description="Missing name")
 
-    data["city_id"] = city_id
-    instance = Place(**data)
-    instance.save()
-    return make_response(jsonify(instance.to_dict()), 201)
+    for data in items:
+        data["city_id"] = city_id
+    return save_new([Place(**data) for data in items], many)
 
 
 @app_views.route('/places/<place_id>', methods=['PUT'], strict_slashes=False)
@@ -110,13 +108,55 @@ def put_place(place_id):
 
     ignore = ['id', 'user_id', 'city_id', 'created_at', 'updated_at']
 
+    changed = False
     for key, value in data.items():
-        if key not in ignore:
+        if key not in ignore and getattr(place, key, None) != value:
             setattr(place, key, value)
-    storage.save()
+            changed = True
+    if changed:
+        storage.save()
     return make_response(jsonify(place.to_dict()), 200)
 
 
+def search_filters():
+    """
+    Returns the lists of the ids of states, cities and amenities of the JSON
+    body of a places_search request, empty when not given
+    """
+    data = request.get_json()
+    if data is None:
+        abort(400, description="Not a JSON")
+    if not data:
+        return [], [], []
+    return (data.get('states') or [], data.get('cities') or [],
+            data.get('amenities') or [])
+
+
+def city_places(states_obj, cities_obj):
+    """
+    Returns the list of the places of the cities of states_obj and of
+    cities_obj, each place once; None stands for an unknown state or city
+    """
+    list_places = []
+    seen = set()
+    cities_obj = [city for state in states_obj if state
+                  for city in state.cities] + cities_obj
+    for city in cities_obj:
+        if city:
+            for place in city.places:
+                if place.id not in seen:
+                    seen.add(place.id)
+                    list_places.append(place)
+    return list_places
+
+
+def with_amenities(list_places, amenities_obj):
+    """Returns the places of list_places that have every amenity of
+    amenities_obj"""
+    return [place for place in list_places
+            if all([am in place.amenities for am in amenities_obj])]
+
+
 @app_views.route('/places_search', methods=['POST'], strict_slashes=False)
 @swag_from('documentation/place/post_search.yml', methods=['POST'])
 def places_search():
@@ -124,57 +164,21 @@ def places_search():
     Retrieves all Place objects depending of the JSON in the body
     of the request
     """
+    states, cities, amenities = search_filters()
+    if not states and not cities and not amenities:
+        return stream_objects(storage.iter(Place))
 
-    if request.get_json() is None:
-        abort(400, description="Not a JSON")
-
-    data = request.get_json()
-
-    if data and len(data):
-        states = data.get('states', None)
-        cities = data.get('cities', None)
-        amenities = data.get('amenities', None)
-
-    if not data or not len(data) or (
-            not states and
-            not cities and
-            not amenities):
-        places = storage.all(Place).values()
-        list_places = []
-        for place in places:
-            list_places.append(place.to_dict())
-        return jsonify(list_places)
-
-    list_places = []
-    if states:
-        states_obj = [storage.get(State, s_id) for s_id in states]
-        for state in states_obj:
-            if state:
-                for city in state.cities:
-                    if city:
-                        for place in city.places:
-                            list_places.append(place)
-
-    if cities:
-        city_obj = [storage.get(City, c_id) for c_id in cities]
-        for city in city_obj:
-            if city:
-                for place in city.places:
-                    if place not in list_places:
-                        list_places.append(place)
+    # the relationships walked, loaded along with the objects
+    places = "places.amenities" if amenities else "places"
+    list_places = city_places(
+        [storage.get(State, s_id, load=["cities." + places])
+         for s_id in states],
+        [storage.get(City, c_id, load=[places]) for c_id in cities])
 
     if amenities:
         if not list_places:
-            list_places = storage.all(Place).values()
-        amenities_obj = [storage.get(Amenity, a_id) for a_id in amenities]
-        list_places = [place for place in list_places
-                       if all([am in place.amenities
-                               for am in amenities_obj])]
-
-    places = []
-    for p in list_places:
-        d = p.to_dict()
-        d.pop('amenities', None)
-        places.append(d)
-
-    return jsonify(places)
+            list_places = storage.all(Place, load=["amenities"]).values()
+        list_places = with_amenities(
+            list_places, [storage.get(Amenity, a_id) for a_id in amenities])
+
+    return jsonify_objects(list_places)
@@ -4,7 +4,8 @@ from models.review import Review
 from models.place import Place
 from models.user import User
 from models import storage
-from api.v1.views import app_views
+from api.v1.views import app_views, json_items, jsonify_page, page_args
+from api.v1.views import save_new
 from flask import abort, jsonify, make_response, request
 from flasgger.utils import swag_from
 
@@ -21,9 +22,9 @@ def get_reviews(place_id):
     if not place:
         abort(404)
 
-    reviews = [review.to_dict() for review in place.reviews]
-
-    return jsonify(reviews)
+    limit, after = page_args()
+    return jsonify_page(storage.find(Review, "place_id", place.id,
+                                     limit=limit, after=after), limit)
 
 
 @app_views.route('/reviews/<review_id>', methods=['GET'], strict_slashes=False)
@@ -63,32 +64,29 @@ def delete_review(review_id):
 @swag_from('documentation/reviews/post_reviews.yml', methods=['POST'])
 def post_review(place_id):
     """
-    Creates a Review
+    Creates a Review, or every Review of a list
     """
     place = storage.get(Place, place_id)
 
     if not place:
         abort(404)
 
-    if not request.get_json():
-        abort(400, description="Not a JSON")
+    items, many = json_items()
 
-    if 'user_id' not in request.get_json():
+    if not all('user_id' in data for data in items):
         abort(400, description="Missing user_id")
 
-    data = request.get_json()
-    user = storage.get(User, data['user_id'])
-
-    if not user:
+    users = [data['user_id'] for data in items]
+    if not all(type(user_id) is str for user_id in users) or \
+       not all(storage.get(User, user_id) for user_id in set(users)):
         abort(404)
 
-    if 'text' not in request.get_json():
+    if not all('text' in data for data in items):
         abort(400, description="Missing text")
 
-    data['place_id'] = place_id
-    instance = Review(**data)
-    instance.save()
-    return make_response(jsonify(instance.to_dict()), 201)
+    for data in items:
+        data['place_id'] = place_id
+    return save_new([Review(**data) for data in items], many)
 
 
 @app_views.route('/reviews/<review_id>', methods=['PUT'], strict_slashes=False)
@@ -108,8 +106,11 @@ def put_review(review_id):
     ignore = ['id', 'user_id', 'place_id', 'created_at', 'updated_at']
 
     data = request.get_json()
+    changed = False
     for key, value in data.items():
-        if key not in ignore:
+        if key not in ignore and getattr(review, key, None) != value:
             setattr(review, key, value)
-    storage.save()
+            changed = True
+    if changed:
+        storage.save()
     return make_response(jsonify(review.to_dict()), 200)
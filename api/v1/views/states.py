@@ -2,7 +2,8 @@
 """ objects that handle all default RestFul API actions for States """
 from models.state import State
 from models import storage
-from api.v1.views import app_views
+from api.v1.views import app_views, json_items, jsonify_page, page_args
+from api.v1.views import save_new
 from flask import abort, jsonify, make_response, request
 from flasgger.utils import swag_from
 
@@ -13,11 +14,9 @@ def get_states():
     """
     Retrieves the list of all State objects
     """
-    all_states = storage.all(State).values()
-    list_states = []
-    for state in all_states:
-        list_states.append(state.to_dict())
-    return jsonify(list_states)
+    limit, after = page_args()
+    all_states = storage.all(State, limit=limit, after=after).values()
+    return jsonify_page(all_states, limit)
 
 
 @app_views.route('/states/<state_id>', methods=['GET'], strict_slashes=False)
@@ -54,18 +53,14 @@ def delete_state(state_id):
 @swag_from('documentation/state/post_state.yml', methods=['POST'])
 def post_state():
     """
-    Creates a State
+    Creates a State, or every State of a list
     """
-    if not request.get_json():
-        abort(400, description="Not a JSON")
+    items, many = json_items()
 
-    if 'name' not in request.get_json():
+    if not all('name' in data for data in items):
         abort(400, description="Missing name")
 
-    data = request.get_json()
-    instance = State(**data)
-    instance.save()
-    return make_response(jsonify(instance.to_dict()), 201)
+    return save_new([State(**data) for data in items], many)
 
 
 @app_views.route('/states/<state_id>', methods=['PUT'], strict_slashes=False)
@@ -85,8 +80,11 @@ def put_state(state_id):
     ignore = ['id', 'created_at', 'updated_at']
 
     data = request.get_json()
+    changed = False
     for key, value in data.items():
-        if key not in ignore:
+        if key not in ignore and getattr(state, key, None) != value:
             setattr(state, key, value)
-    storage.save()
+            changed = True
+    if changed:
+        storage.save()
     return make_response(jsonify(state.to_dict()), 200)
@@ -2,7 +2,8 @@
 """ objects that handle all default RestFul API actions for Users """
 from models.user import User
 from models import storage
-from api.v1.views import app_views
+from api.v1.views import app_views, json_items, jsonify_page, page_args
+from api.v1.views import save_new
 from flask import abort, jsonify, make_response, request
 from flasgger.utils import swag_from
 
@@ -14,11 +15,9 @@ def get_users():
     Retrieves the list of all user objects
     or a specific user
     """
-    all_users = storage.all(User).values()
-    list_users = []
-    for user in all_users:
-        list_users.append(user.to_dict())
-    return jsonify(list_users)
+    limit, after = page_args()
+    all_users = storage.all(User, limit=limit, after=after).values()
+    return jsonify_page(all_users, limit)
 
 
 @app_views.route('/users/<user_id>', methods=['GET'], strict_slashes=False)
@@ -55,20 +54,16 @@ def delete_user(user_id):
 @swag_from('documentation/user/post_user.yml', methods=['POST'])
 def post_user():
     """
-    Creates a user
+    Creates a user, or every user of a list
     """
-    if not request.get_json():
-        abort(400, description="Not a JSON")
+    items, many = json_items()
 
-    if 'email' not in request.get_json():
+    if not all('email' in data for data in items):
         abort(400, description="Missing email")
-    if 'password' not in request.get_json():
+    if not all('password' in data for data in items):
         abort(400, description="Missing password")
 
-    data = request.get_json()
-    instance = User(**data)
-    instance.save()
-    return make_response(jsonify(instance.to_dict()), 201)
+    return save_new([User(**data) for data in items], many)
 
 
 @app_views.route('/users/<user_id>', methods=['PUT'], strict_slashes=False)
@@ -88,8 +83,11 @@ def put_user(user_id):
     ignore = ['id', 'email', 'created_at', 'updated_at']
 
     data = request.get_json()
+    changed = False
     for key, value in data.items():
-        if key not in ignore:
+        if key not in ignore and getattr(user, key, None) != value:
             setattr(user, key, value)
-    storage.save()
+            changed = True
+    if changed:
+        storage.save()
     return make_response(jsonify(user.to_dict()), 200)
@@ -0,0 +1,105 @@
+#!/usr/bin/python3
+"""
+Measures the throughput of the API served by the threaded development
+server with the sync views, then by a single uvicorn worker serving
+api.v1.asgi with the async views (HBNB_ASYNC=1, HBNB_ASYNC_POOL=1), under
+many concurrent clients
+
+Runs against the database set up by the environment, HBNB_TYPE_STORAGE=db
+or sqlite, which it fills with states first. The async views need
+flask[async], sqlalchemy[asyncio], aiomysql or aiosqlite, and uvicorn.
+
+Usage: python3 -m benchmarks.async_views [clients] [seconds]
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+
+paths = ["/api/v1/stats", "/api/v1/states?limit=100",
+         "/api/v1/states/{}/cities"]
+
+
+def start(port, asynchronous):
+    """starts the API on port, returns its process once it answers"""
+    env = dict(os.environ, HBNB_API_PORT=str(port),
+               HBNB_ASYNC="1" if asynchronous else "0",
+               HBNB_ASYNC_POOL="1" if asynchronous else "0")
+    command = [sys.executable, "-m", "api.v1.app"]
+    if asynchronous:
+        command = [sys.executable, "-m", "uvicorn", "api.v1.asgi:asgi_app",
+                   "--port", str(port), "--workers", "1",
+                   "--log-level", "warning"]
+    server = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL,
+                              stderr=subprocess.DEVNULL)
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(url(port, "/api/v1/status"))
+            return server
+        except OSError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError("the API did not start on port {}".format(port))
+
+
+def url(port, path):
+    """returns the URL of path on the API on port"""
+    return "http://127.0.0.1:{}{}".format(port, path)
+
+
+def seed(port, n=1000):
+    """creates n states, returns the id of one of them"""
+    body = json.dumps([{"name": "State {}".format(i)} for i in range(n)])
+    request = urllib.request.Request(url(port, "/api/v1/states"),
+                                     data=body.encode(), method="POST",
+                                     headers={"Content-Type":
+                                              "application/json"})
+    with urllib.request.urlopen(request) as response:
+        return json.load(response)[0]["id"]
+
+
+def client(port, state_id, deadline):
+    """requests the paths in turn until deadline, returns the latencies"""
+    latencies = []
+    while time.perf_counter() < deadline:
+        for path in paths:
+            start = time.perf_counter()
+            with urllib.request.urlopen(url(port, path.format(state_id))) as r:
+                r.read()
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def measure(port, state_id, clients, seconds):
+    """returns the requests per second and the 99th percentile latency in
+    milliseconds of clients requesting the API on port for seconds"""
+    deadline = time.perf_counter() + seconds
+    with ThreadPoolExecutor(clients) as pool:
+        runs = [pool.submit(client, port, state_id, deadline)
+                for _ in range(clients)]
+        latencies = sorted(t for run in runs for t in run.result())
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000
+    return len(latencies) / seconds, p99
+
+
+if __name__ == "__main__":
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 10
+    print("{} clients for {:g} s".format(clients, seconds))
+    print("{:<12}{:>12}{:>12}".format("views", "req/s", "p99 (ms)"))
+    state_id = None
+    for port, asynchronous in ((5051, False), (5052, True)):
+        server = start(port, asynchronous)
+        try:
+            if state_id is None:
+                state_id = seed(port)
+            rate, p99 = measure(port, state_id, clients, seconds)
+        finally:
+            server.terminate()
+            server.wait()
+        print("{:<12}{:>12.0f}{:>12.1f}".format(
+            "asgi" if asynchronous else "threaded", rate, p99))
@@ -0,0 +1,58 @@
+#!/usr/bin/python3
+"""
+Times saving and loading records in each FileStorage format
+
+Usage: python3 -m benchmarks.file_formats [number of records]
+"""
+
+from models.engine import file_formats
+from models.place import Place
+from models.review import Review
+from models.user import User
+import os
+import sys
+import time
+
+
+def make_records(n):
+    """returns n records shaped like those of a real file.json"""
+    records = {}
+    for i in range(n):
+        if i % 3 == 0:
+            obj = User(email="user{}@hbnb.io".format(i), password="pwd",
+                       first_name="Betty", last_name="Holberton")
+        elif i % 3 == 1:
+            obj = Place(name="Place {}".format(i), city_id="c", user_id="u",
+                        description="A nice place to stay", number_rooms=3,
+                        price_by_night=120, latitude=37.77,
+                        longitude=-122.41)
+        else:
+            obj = Review(place_id="p", user_id="u",
+                         text="Great stay, would come back")
+        records[obj.__class__.__name__ + "." + obj.id] = obj.to_dict(1)
+    return records
+
+
+def best(func, runs=3):
+    """returns the best time of a few runs of func, in milliseconds"""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    records = make_records(n)
+    path = "bench_file_formats.tmp"
+    print("{} records".format(n))
+    print("{:<12}{:>12}{:>12}{:>12}".format("format", "save (ms)",
+                                            "load (ms)", "size (KiB)"))
+    for fmt in file_formats.formats:
+        save = best(lambda: file_formats.dump(records, path, fmt))
+        load = best(lambda: file_formats.load(path))
+        size = os.path.getsize(path) // 1024
+        print("{:<12}{:>12.0f}{:>12.0f}{:>12}".format(fmt, save, load, size))
+    os.remove(path)
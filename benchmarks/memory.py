@@ -0,0 +1,88 @@
+#!/usr/bin/python3
+"""
+Measures the memory FileStorage holds per object of each class after a
+reload of file.json, and the part of it __records, which tells whether an
+object changed since it was read, holds
+
+Usage: python3 -m benchmarks.memory [number of objects per class]
+"""
+
+import models
+from models.amenity import Amenity
+from models.city import City
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+import gc
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+import uuid
+
+
+def make_record(cls, i, parents):
+    """returns the record of the i-th object of cls, whose foreign keys
+    point to one of the ids in parents"""
+    parent = parents[i % len(parents)]
+    if cls is Amenity:
+        obj = Amenity(name="Amenity {}".format(i))
+    elif cls is City:
+        obj = City(name="City {}".format(i), state_id=parent)
+    elif cls is Place:
+        obj = Place(name="Place {}".format(i), city_id=parent,
+                    user_id=parent, description="A nice place to stay",
+                    number_rooms=3, price_by_night=120, latitude=37.77,
+                    longitude=-122.41)
+    elif cls is Review:
+        obj = Review(place_id=parent, user_id=parent,
+                     text="Great stay, would come back")
+    elif cls is State:
+        obj = State(name="State {}".format(i))
+    else:
+        obj = User(email="user{}@hbnb.io".format(i), password="pwd",
+                   first_name="Betty", last_name="Holberton")
+    return obj.to_dict(save_fs=1)
+
+
+def measure(cls, n):
+    """returns the bytes held per object after reloading n objects of cls,
+    and the bytes of them held by __records"""
+    parents = [str(uuid.uuid4()) for _ in range(100)]
+    records = {}
+    for i in range(n):
+        record = make_record(cls, i, parents)
+        records[cls.__name__ + "." + record["id"]] = record
+    with open("file.json", "w") as f:
+        json.dump(records, f)
+    del records
+    FileStorage._FileStorage__objects = {}
+    FileStorage._FileStorage__records = {}
+    FileStorage._FileStorage__pending = {}
+    FileStorage._FileStorage__stamp = None
+    gc.collect()
+    tracemalloc.start()
+    models.storage.reload()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    FileStorage._FileStorage__records = {}
+    gc.collect()
+    records = size - tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size / n, records / n
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        print("{} objects per class".format(n))
+        print("{:<12}{:>16}{:>12}".format("class", "bytes/object",
+                                          "__records"))
+        for cls in (Amenity, City, Place, Review, State, User):
+            size, records = measure(cls, n)
+            print("{:<12}{:>16.0f}{:>12.0f}".format(cls.__name__, size,
+                                                    records))
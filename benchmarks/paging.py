@@ -0,0 +1,47 @@
+#!/usr/bin/python3
+"""
+Times adding objects to FileStorage before and after a page was read, which
+builds the ordered index of their class, then the next page read
+
+Usage: python3 -m benchmarks.paging [number of objects] [number added]
+"""
+
+import models
+from models.state import State
+import os
+import sys
+import tempfile
+import time
+
+
+def timed(func):
+    """returns the seconds func took"""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def add(n):
+    """adds n states"""
+    states = [State(name="State {}".format(i)) for i in range(n)]
+
+    def run():
+        """adds the states"""
+        for state in states:
+            models.storage.new(state)
+    return timed(run)
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    added = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        models.storage.bulk_new([State(name="State") for _ in range(n)])
+        print("{} states, {} added".format(n, added))
+        print("{:<24}{:>10}".format("", "seconds"))
+        print("{:<24}{:>10.3f}".format("add, no page read", add(added)))
+        models.storage.all(State, limit=10)
+        print("{:<24}{:>10.3f}".format("add after a page read", add(added)))
+        print("{:<24}{:>10.3f}".format("next page read", timed(
+            lambda: models.storage.all(State, limit=10))))
@@ -0,0 +1,57 @@
+#!/usr/bin/python3
+"""
+Times the timestamp conversions of BaseModel, then reloading file.json and
+building a list response with them
+
+Usage: python3 -m benchmarks.timestamps [number of objects]
+"""
+
+from benchmarks.file_formats import best, make_records
+from datetime import datetime
+import models
+from models.base_model import time
+from models.engine.file_storage import FileStorage
+import json
+import os
+import sys
+import tempfile
+import timeit
+
+
+def per_call(stmt, value, number=100000):
+    """returns the time of one run of stmt on value, in microseconds"""
+    env = {"datetime": datetime, "time": time, "value": value}
+    return timeit.timeit(stmt, globals=env, number=number) / number * 1e6
+
+
+def reload():
+    """reloads every object of file.json"""
+    FileStorage._FileStorage__objects = {}
+    FileStorage._FileStorage__records = {}
+    FileStorage._FileStorage__stamp = None
+    models.storage.reload()
+
+
+def list_response():
+    """serializes every object like a list endpoint does"""
+    json.dumps([obj.to_dict() for obj in models.storage.all().values()])
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    now = datetime.utcnow()
+    string = now.strftime(time)
+    print("{:<44}{:>12}".format("conversion", "us/call"))
+    for stmt, value in (("datetime.strptime(value, time)", string),
+                        ("datetime.fromisoformat(value)", string),
+                        ("value.strftime(time)", now),
+                        ("value.isoformat(timespec='microseconds')", now)):
+        print("{:<44}{:>12.2f}".format(stmt, per_call(stmt, value)))
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        with open("file.json", "w") as f:
+            json.dump(make_records(n), f)
+        print("{} objects".format(n))
+        print("{:<44}{:>12.0f}".format("reload (ms)", best(reload)))
+        print("{:<44}{:>12.0f}".format("list response (ms)",
+                                       best(list_response)))
@@ -8,10 +8,21 @@ from os import getenv
 
 storage_t = getenv("HBNB_TYPE_STORAGE")
 
-if storage_t == "db":
+if storage_t == "sqlite":
+    # SQLite is served by the same SQLAlchemy models as MySQL
+    storage_t = "db"
+    from models.engine.sqlite_storage import SQLiteStorage
+    storage = SQLiteStorage()
+elif storage_t == "db":
     from models.engine.db_storage import DBStorage
     storage = DBStorage()
 else:
     from models.engine.file_storage import FileStorage
     storage = FileStorage()
 storage.reload()
+
+# the same database through asyncio, for the async API views
+async_storage = None
+if storage_t == "db" and getenv("HBNB_ASYNC") == "1":
+    from models.engine.async_db_storage import AsyncDBStorage
+    async_storage = AsyncDBStorage()
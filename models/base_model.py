@@ -4,14 +4,22 @@ Contains class BaseModel
 """
 
 from datetime import datetime
+import json
 import models
 from os import getenv
 import sqlalchemy
 from sqlalchemy import Column, String, DateTime
 from sqlalchemy.ext.declarative import declarative_base
+import sys
 import uuid
 
+# format of the timestamps of to_dict(), those of isoformat() with microseconds
 time = "%Y-%m-%dT%H:%M:%S.%f"
+# encoder of to_json(), writing JSON the way jsonify does
+encoder = json.JSONEncoder(sort_keys=True, separators=(",", ":"))
+# types of the values, or of the items of the lists, whose to_dict() can be
+# cached
+scalars = frozenset([str, int, float, bool, type(None)])
 
 if models.storage_t == "db":
     Base = declarative_base()
@@ -19,26 +27,83 @@ else:
     Base = object
 
 
+class Items(list):
+    """a list attribute of an object of the file storage, which tells the
+    object it changed when it is changed in place"""
+    __slots__ = ("owner", "name")
+
+    def __init__(self, items=(), owner=None, name=None):
+        """copies items, the list of the attribute name of owner"""
+        super().__init__(items)
+        self.owner = owner
+        self.name = name
+
+
+def mutator(method):
+    """returns the list method method, telling the owner of the list it
+    changed once it ran"""
+    def mutate(self, *args, **kwargs):
+        """runs the list method, then tells the owner"""
+        result = method(self, *args, **kwargs)
+        if self.owner is not None:
+            self.owner._changed(self.name)
+        return result
+    mutate.__name__ = method.__name__
+    mutate.__doc__ = method.__doc__
+    return mutate
+
+
+for method in ("__setitem__", "__delitem__", "__iadd__", "__imul__",
+               "append", "clear", "extend", "insert", "pop", "remove",
+               "reverse", "sort"):
+    setattr(Items, method, mutator(getattr(list, method)))
+
+
+def parse_time(value):
+    """returns the datetime of a timestamp of to_dict(), with fromisoformat
+    for the strings isoformat() writes and strptime(value, time) for the
+    others, so that no other string is accepted than with strptime"""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        parsed = None
+    if parsed is None or parsed.tzinfo is not None or len(value) > 26 or \
+       value[10:11] != "T" or value[19:20] != ".":
+        return datetime.strptime(value, time)
+    return parsed
+
+
 class BaseModel:
     """The BaseModel class from which future classes will be derived"""
     if models.storage_t == "db":
         id = Column(String(60), primary_key=True)
         created_at = Column(DateTime, default=datetime.utcnow)
         updated_at = Column(DateTime, default=datetime.utcnow)
+    else:
+        # list - to_dict(), to_dict(save_fs=1) and the JSON bytes of
+        # to_dict(), kept until an attribute is set or a list attribute is
+        # changed in place, None if there are none, False while __init__ runs
+        __slots__ = ("__dict__", "__weakref__", "__cache")
 
     def __init__(self, *args, **kwargs):
         """Initialization of the base model"""
+        if models.storage_t != "db":
+            self.__cache = False
         if kwargs:
             for key, value in kwargs.items():
                 if key != "__class__":
                     setattr(self, key, value)
-            if kwargs.get("created_at", None) and type(self.created_at) is str:
-                self.created_at = datetime.strptime(kwargs["created_at"], time)
-            else:
+            created_at = kwargs.get("created_at", None)
+            if created_at and type(created_at) is str:
+                self.created_at = parse_time(created_at)
+            elif not isinstance(created_at, datetime):
                 self.created_at = datetime.utcnow()
-            if kwargs.get("updated_at", None) and type(self.updated_at) is str:
-                self.updated_at = datetime.strptime(kwargs["updated_at"], time)
-            else:
+            updated_at = kwargs.get("updated_at", None)
+            if updated_at and updated_at == created_at:
+                self.updated_at = self.created_at
+            elif updated_at and type(updated_at) is str:
+                self.updated_at = parse_time(updated_at)
+            elif not isinstance(updated_at, datetime):
                 self.updated_at = datetime.utcnow()
             if kwargs.get("id", None) is None:
                 self.id = str(uuid.uuid4())
@@ -46,6 +111,38 @@ class BaseModel:
             self.id = str(uuid.uuid4())
             self.created_at = datetime.utcnow()
             self.updated_at = self.created_at
+        if models.storage_t != "db":
+            self.__cache = None
+
+    if models.storage_t != "db":
+        def __setattr__(self, name, value):
+            """sets an attribute, dropping the cached to_dict() and telling
+            the storage the object changed"""
+            if name == "_BaseModel__cache":
+                super().__setattr__(name, value)
+                return
+            if name.endswith("_id") and type(value) is str:
+                value = sys.intern(value)
+            elif isinstance(value, list) and not (
+                    type(value) is Items and value.owner is self and
+                    value.name == name):
+                value = Items(value, self, name)
+            super().__setattr__(name, value)
+            if self.__cache is not False:
+                self._changed(name)
+
+        def __delattr__(self, name):
+            """deletes an attribute, dropping the cached to_dict() and telling
+            the storage the object changed"""
+            super().__delattr__(name)
+            self._changed(name)
+
+        def _changed(self, name):
+            """drops the cached to_dict() and tells the storage the object
+            changed, after its attribute name was set, deleted or changed in
+            place"""
+            self.__cache = None
+            models.storage.touch(self, name)
 
     def __str__(self):
         """String representation of the BaseModel class"""
@@ -58,20 +155,56 @@ class BaseModel:
         models.storage.new(self)
         models.storage.save()
 
-    def to_dict(self, save_fs=None):
-        """returns a dictionary containing all keys/values of the instance"""
+    def __serialized(self, keep=True):
+        """returns to_dict(), to_dict(save_fs=1) and the JSON bytes of
+        to_dict() or None, kept until an attribute is set or one of its lists
+        changes if keep and every value is a scalar or a list of scalars"""
+        cache = getattr(self, "_BaseModel__cache", None)
+        if cache is not None:
+            return cache
         new_dict = self.__dict__.copy()
         if "created_at" in new_dict:
-            new_dict["created_at"] = new_dict["created_at"].strftime(time)
+            new_dict["created_at"] = new_dict["created_at"].isoformat(
+                timespec="microseconds")
         if "updated_at" in new_dict:
-            new_dict["updated_at"] = new_dict["updated_at"].strftime(time)
+            new_dict["updated_at"] = new_dict["updated_at"].isoformat(
+                timespec="microseconds")
         new_dict["__class__"] = self.__class__.__name__
         if "_sa_instance_state" in new_dict:
             del new_dict["_sa_instance_state"]
+            mapper = sqlalchemy.inspect(self.__class__)
+            for name in mapper.relationships.keys():
+                new_dict.pop(name, None)
+        public = new_dict
+        if "password" in new_dict:
+            public = new_dict.copy()
+            del public["password"]
+        for name, value in new_dict.items():
+            if isinstance(value, list):
+                new_dict[name] = list(value)
+                if public is not new_dict:
+                    public[name] = new_dict[name]
+                keep = keep and scalars.issuperset(map(type, value))
+            elif type(value) not in scalars:
+                keep = False
+        cache = [public, new_dict, None]
+        if keep and models.storage_t != "db":
+            self.__cache = cache
+        return cache
+
+    def to_dict(self, save_fs=None):
+        """returns a dictionary containing all keys/values of the instance"""
         if save_fs is None:
-            if "password" in new_dict:
-                del new_dict["password"]
-        return new_dict
+            return dict(self.__serialized()[0])
+        return dict(self.__serialized(False)[1])
+
+    def to_json(self):
+        """returns the JSON bytes of to_dict(), with sorted keys and no
+        spaces like jsonify writes them"""
+        cache = self.__serialized()
+        if cache[2] is None:
+            cache[2] = encoder.encode(cache[0]).encode()
+        return cache[2]
 
     def delete(self):
         """delete the current instance from the storage"""
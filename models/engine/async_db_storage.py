@@ -0,0 +1,153 @@
+#!/usr/bin/python3
+"""
+Contains the class AsyncDBStorage
+
+AsyncDBStorage serves the same database as DBStorage through asyncio, over
+aiomysql for MySQL or aiosqlite for SQLite, so that a coroutine waiting on
+a query leaves its event loop free. Its methods are coroutines, but new().
+Relationships are not loaded on access: the paths a caller walks must be
+passed as load.
+"""
+
+from models.engine.db_storage import classes, loaders, pool_options
+import asyncio
+from os import getenv
+import sqlalchemy
+from sqlalchemy.ext.asyncio import async_scoped_session, async_sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+
+class AsyncDBStorage:
+    """interacts with the MySQL or SQLite database through asyncio"""
+    __engine = None
+    __session = None
+
+    def __init__(self):
+        """Instantiate an AsyncDBStorage object"""
+        self.__engine = self._create_engine()
+        sess_factory = async_sessionmaker(bind=self.__engine,
+                                          expire_on_commit=False)
+        # one session per task, like DBStorage has one per thread
+        self.__session = async_scoped_session(sess_factory,
+                                              scopefunc=asyncio.current_task)
+
+    def _create_engine(self):
+        """
+        returns the async engine of the database DBStorage uses; Flask runs
+        each async view in its own event loop, and a connection cannot move
+        from one loop to another, so connections are not pooled unless
+        HBNB_ASYNC_POOL=1, for servers that run a single loop
+        """
+        options = pool_options()
+        del options["poolclass"]
+        if getenv('HBNB_ASYNC_POOL') != "1":
+            options = {"poolclass": NullPool}
+        if getenv('HBNB_TYPE_STORAGE') == "sqlite":
+            HBNB_SQLITE_PATH = getenv('HBNB_SQLITE_PATH', 'hbnb.db')
+            return create_async_engine('sqlite+aiosqlite:///{}'.
+                                       format(HBNB_SQLITE_PATH), **options)
+        return create_async_engine('mysql+aiomysql://{}:{}@{}/{}'.
+                                   format(getenv('HBNB_MYSQL_USER'),
+                                          getenv('HBNB_MYSQL_PWD'),
+                                          getenv('HBNB_MYSQL_HOST'),
+                                          getenv('HBNB_MYSQL_DB')),
+                                   **options)
+
+    async def all(self, cls=None, load=None, limit=None, after=None):
+        """query on the session of the current task, like DBStorage.all()"""
+        new_dict = {}
+        for clss in classes:
+            if cls is None or cls is classes[clss] or cls is clss:
+                query = sqlalchemy.select(classes[clss])
+                if cls is not None and load:
+                    query = query.options(*loaders(classes[clss], load))
+                for obj in await self._page(query, classes[clss], limit,
+                                            after):
+                    new_dict[obj.__class__.__name__ + '.' + obj.id] = obj
+        if cls is None and (limit is not None or after is not None):
+            objs = sorted(new_dict.items(), key=lambda item: item[1].id)
+            new_dict = dict(objs[:limit])
+        return new_dict
+
+    async def iter(self, cls=None, batch_size=1000):
+        """yields the objects of cls, or of every class, streaming
+        batch_size rows at a time"""
+        for clss in classes:
+            if cls is None or cls is classes[clss] or cls is clss:
+                query = sqlalchemy.select(classes[clss]).execution_options(
+                    yield_per=batch_size)
+                async for obj in await self.__session.stream_scalars(query):
+                    yield obj
+
+    async def find(self, cls, attr, value, limit=None, after=None):
+        """returns the list of the objects of cls whose attr is value, or
+        the first limit of them whose id comes after the id after"""
+        query = sqlalchemy.select(cls).where(getattr(cls, attr) == value)
+        return await self._page(query, cls, limit, after)
+
+    async def _page(self, query, cls, limit, after):
+        """returns the objects of query, or the first limit of them whose
+        id comes after the id after"""
+        if limit is not None or after is not None:
+            if after is not None:
+                query = query.where(cls.id > after)
+            query = query.order_by(cls.id).limit(limit)
+        return list((await self.__session.execute(query)).scalars())
+
+    def new(self, obj):
+        """add the object to the session of the current task"""
+        self.__session.add(obj)
+
+    async def bulk_new(self, objs):
+        """add every object of objs to the session, then commit them"""
+        self.__session.add_all(objs)
+        await self.save()
+
+    async def save(self):
+        """commit all changes of the session of the current task"""
+        await self.__session.commit()
+
+    async def delete(self, obj=None):
+        """delete obj from the session of the current task if not None"""
+        if obj is not None:
+            await self.__session.delete(obj)
+
+    async def close(self):
+        """closes the session of the current task"""
+        await self.__session.remove()
+
+    async def get(self, cls, id, load=None):
+        """returns the object of cls with the ID id, or None if not found,
+        loaded with the relationship paths in load, even if the session
+        already holds it"""
+        if cls not in classes.values() or id is None:
+            return None
+        return await self.__session.get(cls, id, options=loaders(cls, load),
+                                        populate_existing=bool(load))
+
+    async def count(self, cls=None):
+        """returns the number of objects of cls, or of every class"""
+        if not cls:
+            return sum((await self.counts()).values())
+        cls = classes.get(cls, cls)
+        if cls not in classes.values():
+            return 0
+        return (await self.counts([cls]))[cls.__name__]
+
+    async def counts(self, clss=None):
+        """returns the number of objects of each class of clss, or of every
+        class, by class name, counted in a single query, 0 for the names of
+        no class"""
+        if clss is None:
+            clss = classes.values()
+        clss = [classes.get(cls, cls) for cls in clss]
+        known = [cls for cls in clss if cls in classes.values()]
+        row = ()
+        if known:
+            row = (await self.__session.execute(sqlalchemy.select(*[
+                sqlalchemy.select(sqlalchemy.func.count()).select_from(cls).
+                scalar_subquery() for cls in known]))).one()
+        counts = dict(zip(known, row))
+        return {getattr(cls, "__name__", cls): counts.get(cls, 0)
+                for cls in clss}
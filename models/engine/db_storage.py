@@ -11,53 +11,234 @@ from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
+from models.engine import migrations
+from contextlib import contextmanager
+import os
 from os import getenv
+import random
 import sqlalchemy
 from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.orm import Session, scoped_session, selectinload, sessionmaker
+from sqlalchemy.pool import QueuePool
+import threading
+import time
+import weakref
 
 classes = {"Amenity": Amenity, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+# create_engine() pool settings, by the environment variable that sets them
+pool_settings = {"HBNB_DB_POOL_SIZE": ("pool_size", int),
+                 "HBNB_DB_MAX_OVERFLOW": ("max_overflow", int),
+                 "HBNB_DB_POOL_RECYCLE": ("pool_recycle", int),
+                 "HBNB_DB_POOL_TIMEOUT": ("pool_timeout", float)}
+
+
+def pool_options():
+    """returns the create_engine() pool settings set by the environment"""
+    options = {"poolclass": MeteredPool,
+               "pool_pre_ping": getenv("HBNB_DB_POOL_PRE_PING") == "1"}
+    for var, (option, kind) in pool_settings.items():
+        if getenv(var):
+            options[option] = kind(getenv(var))
+    return options
+
+
+def loaders(cls, load):
+    """
+    returns the loader options of load for a query of cls: a path of
+    relationship names such as "cities.places" is loaded with one
+    SELECT ... IN per relationship, other options are kept as they are
+    """
+    options = []
+    for path in load or ():
+        if not isinstance(path, str):
+            options.append(path)
+            continue
+        option, owner = None, cls
+        for name in path.split("."):
+            attr = getattr(owner, name)
+            if option is None:
+                option = selectinload(attr)
+            else:
+                option = option.selectinload(attr)
+            owner = attr.property.mapper.class_
+        options.append(option)
+    return options
+
+
+# the DBStorage objects alive, whose connections a forked worker must not
+# share with its parent
+instances = weakref.WeakSet()
+
+
+def after_fork():
+    """gives every DBStorage object of a forked worker its own pool"""
+    for storage in list(instances):
+        storage._after_fork()
+
+
+os.register_at_fork(after_in_child=after_fork)
+
+
+class MeteredPool(QueuePool):
+    """a QueuePool that measures how long connections are waited for"""
+
+    def __init__(self, *args, **kwargs):
+        """Instantiate a MeteredPool object"""
+        super().__init__(*args, **kwargs)
+        self.metrics = {"checkouts": 0, "timeouts": 0,
+                        "wait_total": 0.0, "wait_max": 0.0}
+        self.__lock = threading.Lock()
+
+    def _do_get(self):
+        """hands out a connection, timing the wait for it"""
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except sqlalchemy.exc.TimeoutError:
+            with self.__lock:
+                self.metrics["timeouts"] += 1
+            raise
+        wait = time.perf_counter() - start
+        with self.__lock:
+            self.metrics["checkouts"] += 1
+            self.metrics["wait_total"] += wait
+            self.metrics["wait_max"] = max(self.metrics["wait_max"], wait)
+        return conn
+
+
+class RoutingSession(Session):
+    """a Session that reads from one of the replicas until it writes, then
+    sticks to the primary so that it reads its own writes"""
+
+    def __init__(self, replicas=(), **kwargs):
+        """Instantiate a RoutingSession object"""
+        super().__init__(**kwargs)
+        self.replica = random.choice(replicas) if replicas else None
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        """returns the engine to run clause on"""
+        if self.replica is not None and (
+                self._flushing or isinstance(clause, (
+                    sqlalchemy.Insert, sqlalchemy.Update, sqlalchemy.Delete))):
+            self.replica = None
+        if self.replica is not None:
+            return self.replica
+        return super().get_bind(mapper, clause=clause, **kw)
 
 
 class DBStorage:
     """interaacts with the MySQL database"""
     __engine = None
+    __replicas = []
     __session = None
+    # depth of the batch() blocks run by each thread, like its session
+    __batching = threading.local()
 
     def __init__(self):
         """Instantiate a DBStorage object"""
-        HBNB_MYSQL_USER = getenv('HBNB_MYSQL_USER')
-        HBNB_MYSQL_PWD = getenv('HBNB_MYSQL_PWD')
-        HBNB_MYSQL_HOST = getenv('HBNB_MYSQL_HOST')
-        HBNB_MYSQL_DB = getenv('HBNB_MYSQL_DB')
         HBNB_ENV = getenv('HBNB_ENV')
-        self.__engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'.
-                                      format(HBNB_MYSQL_USER,
-                                             HBNB_MYSQL_PWD,
-                                             HBNB_MYSQL_HOST,
-                                             HBNB_MYSQL_DB))
+        self.__engine = self._create_engine()
+        self.__replicas = self._create_replicas()
         if HBNB_ENV == "test":
             Base.metadata.drop_all(self.__engine)
+        instances.add(self)
 
-    def all(self, cls=None):
-        """query on the current database session"""
+    def _create_engine(self, host=None):
+        """returns the engine of the MySQL database on host, or on
+        HBNB_MYSQL_HOST"""
+        HBNB_MYSQL_USER = getenv('HBNB_MYSQL_USER')
+        HBNB_MYSQL_PWD = getenv('HBNB_MYSQL_PWD')
+        HBNB_MYSQL_HOST = host or getenv('HBNB_MYSQL_HOST')
+        HBNB_MYSQL_DB = getenv('HBNB_MYSQL_DB')
+        return create_engine('mysql+mysqldb://{}:{}@{}/{}'.
+                             format(HBNB_MYSQL_USER,
+                                    HBNB_MYSQL_PWD,
+                                    HBNB_MYSQL_HOST,
+                                    HBNB_MYSQL_DB),
+                             **pool_options())
+
+    def _create_replicas(self):
+        """returns the engines of the read replicas of the MySQL database,
+        on the comma-separated hosts of HBNB_MYSQL_REPLICA_HOSTS"""
+        hosts = getenv('HBNB_MYSQL_REPLICA_HOSTS')
+        if not hosts:
+            return []
+        return [self._create_engine(host) for host in hosts.split(",")]
+
+    def all(self, cls=None, load=None, limit=None, after=None):
+        """query on the current database session, loading the relationship
+        paths in load along with the objects of cls, or only the first
+        limit objects whose id comes after the id after, by id"""
         new_dict = {}
         for clss in classes:
             if cls is None or cls is classes[clss] or cls is clss:
-                objs = self.__session.query(classes[clss]).all()
+                query = self.__session.query(classes[clss])
+                if cls is not None and load:
+                    query = query.options(*loaders(classes[clss], load))
+                objs = self._page(query, classes[clss], limit, after)
                 for obj in objs:
                     key = obj.__class__.__name__ + '.' + obj.id
                     new_dict[key] = obj
+        if cls is None and (limit is not None or after is not None):
+            objs = sorted(new_dict.items(), key=lambda item: item[1].id)
+            new_dict = dict(objs[:limit])
         return (new_dict)
 
+    def iter(self, cls=None, batch_size=1000):
+        """yields the objects of cls, or of every class, fetching batch_size
+        rows at a time through a server-side cursor where the database
+        has one"""
+        for clss in classes:
+            if cls is None or cls is classes[clss] or cls is clss:
+                query = sqlalchemy.select(classes[clss]).execution_options(
+                    yield_per=batch_size)
+                yield from self.__session.execute(query).scalars()
+
+    def find(self, cls, attr, value, limit=None, after=None):
+        """returns the list of the objects of cls whose attr is value, or
+        the first limit of them whose id comes after the id after"""
+        query = self.__session.query(cls).filter(getattr(cls, attr) == value)
+        return self._page(query, cls, limit, after)
+
+    def _page(self, query, cls, limit, after):
+        """returns the objects of query, or the first limit of them whose
+        id comes after the id after, walking the primary key index"""
+        if limit is None and after is None:
+            return query.all()
+        if after is not None:
+            query = query.filter(cls.id > after)
+        return query.order_by(cls.id).limit(limit).all()
+
     def new(self, obj):
         """add the object to the current database session"""
         self.__session.add(obj)
 
+    def bulk_new(self, objs):
+        """add every object of objs to the current database session, then
+        commit them, the objects of each class inserted in batches"""
+        self.__session.add_all(objs)
+        self.save()
+
     def save(self):
         """commit all changes of the current database session"""
-        self.__session.commit()
+        if not getattr(self.__batching, "depth", 0):
+            self.__session.commit()
+
+    @contextmanager
+    def batch(self):
+        """defers every commit until the end of the block, then commits once,
+        or rolls the session back if the block raises"""
+        self.__batching.depth = getattr(self.__batching, "depth", 0) + 1
+        try:
+            yield self
+        except BaseException:
+            self.__batching.depth -= 1
+            self.__session.rollback()
+            raise
+        self.__batching.depth -= 1
+        if not self.__batching.depth:
+            self.__session.commit()
 
     def delete(self, obj=None):
         """delete from the current database session obj if not None"""
@@ -67,40 +248,76 @@ class DBStorage:
     def reload(self):
         """reloads data from the database"""
         Base.metadata.create_all(self.__engine)
-        sess_factory = sessionmaker(bind=self.__engine, expire_on_commit=False)
-        Session = scoped_session(sess_factory)
-        self.__session = Session
+        migrations.upgrade(self.__engine)
+        self.__session = self._new_session()
+
+    def _new_session(self):
+        """returns a new scoped session on the engine, which reads from the
+        replicas if there are any"""
+        sess_factory = sessionmaker(bind=self.__engine, expire_on_commit=False,
+                                    class_=RoutingSession,
+                                    replicas=self.__replicas)
+        return scoped_session(sess_factory)
+
+    def _after_fork(self):
+        """gives a forked worker its own pool and session, leaving the
+        connections inherited from the parent to it"""
+        for engine in [self.__engine] + self.__replicas:
+            engine.dispose(close=False)
+        if self.__session is not None:
+            self.__session = self._new_session()
+
+    def pool_stats(self):
+        """returns the state of the connection pool and its wait times"""
+        pool = self.__engine.pool
+        stats = {"size": pool.size(), "checked_in": pool.checkedin(),
+                 "checked_out": pool.checkedout(),
+                 "overflow": pool.overflow()}
+        stats.update(getattr(pool, "metrics", {}))
+        return stats
 
     def close(self):
         """call remove() method on the private session attribute"""
         self.__session.remove()
 
-    def get(self, cls, id):
+    def get(self, cls, id, load=None):
         """
         Return -> object based on class name and its ID,
-        or None if not found
+        or None if not found, loaded with the relationship paths in load,
+        even if the session already holds it
         """
-        if cls not in classes.values():
+        if cls not in classes.values() or id is None:
             return None
 
-        all_Clss = models.storage.all(cls)
-        for value in all_Clss.values():
-            if (value.id == id):
-                return value
-
-        return None
+        return self.__session.get(cls, id, options=loaders(cls, load),
+                                  populate_existing=bool(load))
 
     def count(self, cls=None):
         """
         to count the nbr of objects in storage.
         """
-        all_Clss = classes.values()
-
         if not cls:
-            count = 0
-            for clss in all_Clss:
-                count += len(models.storage.all(clss).values())
-        else:
-            count = len(models.storage.all(cls).values())
+            return sum(self.counts().values())
+        cls = classes.get(cls, cls)
+        if cls not in classes.values():
+            return 0
+        return self.counts([cls])[cls.__name__]
 
-        return count
+    def counts(self, clss=None):
+        """
+        returns the number of objects of each class of clss, or of every
+        class, by class name, counted by the database in a single query,
+        0 for the names of no class
+        """
+        if clss is None:
+            clss = classes.values()
+        clss = [classes.get(cls, cls) for cls in clss]
+        known = [cls for cls in clss if cls in classes.values()]
+        row = ()
+        if known:
+            row = self.__session.execute(sqlalchemy.select(*[
+                sqlalchemy.select(sqlalchemy.func.count()).select_from(cls).
+                scalar_subquery() for cls in known])).one()
+        counts = dict(zip(known, row))
+        return {getattr(cls, "__name__", cls): counts.get(cls, 0)
+                for cls in clss}
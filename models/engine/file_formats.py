@@ -0,0 +1,81 @@
+#!/usr/bin/python3
+"""
+Contains the on-disk formats FileStorage can read and write
+
+A format is a base format, "json" or "marshal", optionally followed by
+".gz" for a gzip-compressed file. Records always come in and out as the
+dictionaries returned by to_dict(save_fs=1), keyed by <class name>.id.
+The marshal format groups the records by class so that neither the key
+nor __class__ is stored with each of them. Timestamps stay ISO strings:
+datetime.fromisoformat() reads them faster than any epoch conversion.
+"""
+
+import gzip
+import json
+import marshal
+import os
+import sys
+
+formats = ["json", "json.gz", "marshal", "marshal.gz"]
+# bytes - header of the marshal format, followed by its version
+MAGIC = b"HBNB\x02"
+
+
+def pack(records):
+    """returns records as marshal bytes, grouped by class"""
+    classes = {}
+    for record in records.values():
+        attrs = record.copy()
+        name = attrs.pop("__class__")
+        classes.setdefault(name, []).append(attrs)
+    return MAGIC + marshal.dumps(classes)
+
+
+def unpack(data):
+    """returns the records packed in marshal bytes"""
+    records = {}
+    for name, rows in marshal.loads(data[len(MAGIC):]).items():
+        for attrs in rows:
+            attrs["__class__"] = name
+            records[name + "." + attrs["id"]] = attrs
+    return records
+
+
+def dump(records, path, fmt="json"):
+    """writes records to the file at path in the format fmt"""
+    if fmt not in formats:
+        raise ValueError("unknown format {}".format(fmt))
+    if fmt.startswith("marshal"):
+        data = pack(records)
+    else:
+        data = json.dumps(records).encode()
+    if fmt.endswith(".gz"):
+        data = gzip.compress(data, 1)
+    with open(path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def load(path):
+    """returns the records of the file at path, whatever its format"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data[:2] == b"\x1f\x8b":
+        data = gzip.decompress(data)
+    if data[:len(MAGIC)] == MAGIC:
+        return unpack(data)
+    return json.loads(data)
+
+
+def convert(src, dst, fmt):
+    """rewrites the file at src to dst in the format fmt"""
+    dump(load(src), dst, fmt)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4 or sys.argv[3] not in formats:
+        print("Usage: {} <source> <destination> <{}>".format(
+            sys.argv[0], "|".join(formats)))
+        sys.exit(1)
+    convert(*sys.argv[1:])
@@ -12,10 +12,32 @@ from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
+from models.engine import file_formats
+import bisect
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+import fcntl
 from hashlib import md5
+import os
+from os import getenv
+import threading
 
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+# foreign keys indexed to serve the relationship properties, by class name
+foreign_keys = {"City": ("state_id",), "Place": ("city_id", "user_id"),
+                "Review": ("place_id", "user_id")}
+
+
+def fingerprint(record):
+    """returns the hash of the items of record, which FileStorage keeps to
+    tell whether an object changed instead of a copy of its record"""
+    items = [(name, tuple(value) if type(value) is list else value)
+             for name, value in record.items()]
+    try:
+        return hash(frozenset(items))
+    except TypeError:
+        return hash(json.dumps(record, sort_keys=True))
 
 
 class FileStorage:
@@ -23,82 +45,870 @@ class FileStorage:
 
     # string - path to the JSON file
     __file_path = "file.json"
+    # string - format the JSON file is written in, see file_formats.formats
+    __format = getenv("HBNB_FS_FORMAT", "json")
+    # string - directory holding one file per class instead of the JSON file
+    __shards = getenv("HBNB_FS_SHARDS")
+    # string - "thread" or "process", the kind of pool reading the shards
+    __pool_kind = getenv("HBNB_FS_POOL", "thread")
+    # integer - number of workers in the pool reading the shards
+    __workers = int(getenv("HBNB_FS_WORKERS", os.cpu_count() or 1))
+    # the pool reading the shards
+    __pool = None
+    # string - path to the journal of the changes made since the JSON file
+    __journal_path = "file.json.journal"
+    # boolean - append changes to the journal instead of rewriting the file
+    __journal = getenv("HBNB_FS_JOURNAL") == "1"
+    # integer - size in bytes past which the journal is compacted
+    __journal_max = int(getenv("HBNB_FS_JOURNAL_MAX", 1048576))
+    # float - seconds during which saves are coalesced into one write
+    __flush_window = float(getenv("HBNB_FS_FLUSH_WINDOW", 0))
+    # timer writing the objects at the end of the flush window
+    __flusher = None
+    # depth of the batch() blocks run by each thread, and the records of the
+    # keys they changed as they were before the block
+    __batching = threading.local()
+    # boolean - whether a save is waiting for a batch or the flush window
+    __deferred = False
+    # boolean - only build objects from their records when first accessed
+    __lazy = getenv("HBNB_FS_LAZY") == "1"
     # dictionary - empty but will store all objects by <class name>.id
     __objects = {}
+    # dictionary - the same objects bucketed by <class name>, then by key
+    __classes = {}
+    # the __objects dictionary that __classes was built from
+    __indexed = None
+    # dictionary - keys of the objects and records by (<class name>, foreign
+    # key), then by value of the foreign key
+    __refs = {}
+    # dictionary - values of the foreign keys each key is indexed under
+    __ref_values = {}
+    # dictionary - sorted ids of the objects and records, by <class name>,
+    # and by (<class name>, foreign key, value) for the objects whose foreign
+    # key has that value, built for the classes and values paged through
+    __order = {}
+    # dictionary - sets of the ids added to and removed from each ordered
+    # index since it was last sorted, merged into it when it is next read,
+    # so that adding objects does not move the ids of the index each time
+    __unsorted = {}
+    # dictionary - records not built into objects yet, by <class name>, key
+    __pending = {}
+    # dictionary - keys of the objects added, changed or deleted since the
+    # last save, as a set ordered like a dictionary
+    __dirty = {}
+    # the __objects dictionary that __dirty tracks the changes of
+    __tracked = None
+    # dictionary - the fingerprints of the records on disk as last read or
+    # written, by key: the records are rebuilt from the objects to be written
+    # and read back from the files to be compacted or rolled back
+    __records = {}
+    # (mtime, size, inode) of the JSON file and journal, and number of writes
+    # made to them, as last read or written
+    __stamp = None
+    # integer - offset in the journal up to which entries were read or written
+    __journal_pos = 0
+    # lock held while reading or writing the files
+    __lock = threading.RLock()
+    # string - path to the file locked while other processes read or write,
+    # which holds the number of writes made to the files
+    __lock_path = "file.json.lock"
+    # the lock file descriptor of the process whose pid is __lock_pid
+    __lock_fd = None
+    __lock_pid = None
+    # integer - number of nested blocks holding the lock file
+    __lock_depth = 0
+    # boolean - whether a compaction is running
+    __compacting = False
+
+    def __sharded(self):
+        """returns whether the objects are read from per-class shards"""
+        return self.__shards is not None and os.path.isdir(self.__shards)
+
+    def __shard_paths(self):
+        """returns the path to the shard of every class, by class name, named
+        <class name>.<format>"""
+        paths = {}
+        for name in os.listdir(self.__shards):
+            cls, _, fmt = name.partition(".")
+            if cls in classes and fmt in file_formats.formats:
+                if cls not in paths or fmt == self.__format:
+                    paths[cls] = os.path.join(self.__shards, name)
+        return paths
+
+    def __stat(self):
+        """returns what identifies the current version of the files"""
+        stamp = []
+        if self.__sharded():
+            paths = sorted(self.__shard_paths().values())
+            stamp.append(tuple(self.__stat_path(path) for path in paths))
+        else:
+            stamp.append(self.__stat_path(self.__file_path))
+        stamp.append(self.__stat_path(self.__journal_path))
+        stamp.append(os.pread(self.__lock_file(), 20, 0))
+        return tuple(stamp)
+
+    def __stat_path(self, path):
+        """returns the (mtime, size, inode) of a file, None if missing"""
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def __executor(self):
+        """returns the pool reading the shards"""
+        if FileStorage.__pool is None:
+            if self.__pool_kind == "process":
+                FileStorage.__pool = ProcessPoolExecutor(self.__workers)
+            else:
+                FileStorage.__pool = ThreadPoolExecutor(self.__workers)
+        return FileStorage.__pool
+
+    def __load(self):
+        """returns the records of the JSON file, or of every shard"""
+        if self.__sharded():
+            jo = {}
+            paths = self.__shard_paths().values()
+            for records in self.__executor().map(file_formats.load, paths):
+                jo.update(records)
+            return jo
+        if os.path.exists(self.__file_path):
+            return file_formats.load(self.__file_path)
+        return {}
 
-    def all(self, cls=None):
-        """returns the dictionary __objects"""
-        if cls is not None:
-            new_dict = {}
+    def __write_shards(self, shards):
+        """replaces the shards of the classes in shards by their records"""
+        os.makedirs(self.__shards, exist_ok=True)
+        for name, records in shards.items():
+            path = os.path.join(self.__shards, name + "." + self.__format)
+            os.replace(self.__dump(path, records), path)
+            for fmt in file_formats.formats:
+                old = os.path.join(self.__shards, name + "." + fmt)
+                if fmt != self.__format and os.path.exists(old):
+                    os.remove(old)
+
+    @contextmanager
+    def __locked(self, operation):
+        """
+        holds the lock file with operation, fcntl.LOCK_SH to read the files
+        or fcntl.LOCK_EX to write them, so that other processes wait
+        """
+        with self.__lock:
+            fd = self.__lock_file()
+            if not self.__lock_depth:
+                fcntl.flock(fd, operation)
+            FileStorage.__lock_depth += 1
+            try:
+                yield
+            finally:
+                FileStorage.__lock_depth -= 1
+                if not self.__lock_depth:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def __lock_file(self):
+        """returns the lock file descriptor of the current process"""
+        with self.__lock:
+            if FileStorage.__lock_pid != os.getpid():
+                FileStorage.__lock_fd = os.open(self.__lock_path,
+                                                os.O_RDWR | os.O_CREAT)
+                FileStorage.__lock_pid = os.getpid()
+                FileStorage.__lock_depth = 0
+            return self.__lock_fd
+
+    def __bump(self):
+        """counts a write made to the files, with the lock file held"""
+        writes = int(os.pread(self.__lock_file(), 20, 0) or 0)
+        os.pwrite(self.__lock_file(), b"%020d" % (writes + 1), 0)
+        FileStorage.__stamp = self.__stat()
+
+    def __dump(self, path, data):
+        """writes data next to path, returns the temporary file"""
+        tmp = "{}.{}.{}.tmp".format(path, os.getpid(), threading.get_ident())
+        file_formats.dump(data, tmp, self.__format)
+        return tmp
+
+    def __bucket(self, cls):
+        """returns the dictionary of the objects of cls, by key"""
+        if FileStorage.__indexed is not self.__objects:
+            FileStorage.__indexed = self.__objects
+            self.__classes.clear()
+            self.__refs.clear()
+            self.__ref_values.clear()
+            self.__order.clear()
+            self.__unsorted.clear()
             for key, value in self.__objects.items():
-                if cls == value.__class__ or cls == value.__class__.__name__:
-                    new_dict[key] = value
-            return new_dict
-        return self.__objects
+                name = value.__class__.__name__
+                self.__classes.setdefault(name, {})[key] = value
+                self.__index(key, self.__fk_values(value))
+            for waiting in self.__pending.values():
+                for key, record in waiting.items():
+                    self.__index(key, self.__fk_values(record))
+        if type(cls) is not str:
+            cls = cls.__name__
+        if cls not in self.__classes:
+            self.__classes[cls] = {}
+        return self.__classes[cls]
+
+    def __waiting(self, cls):
+        """returns the dictionary of the records of cls not built yet"""
+        if type(cls) is not str:
+            cls = cls.__name__
+        if cls not in self.__pending:
+            self.__pending[cls] = {}
+        return self.__pending[cls]
+
+    def __fk_values(self, obj):
+        """returns the values of the indexed foreign keys of obj, an object
+        or a record"""
+        if type(obj) is dict:
+            cls = classes[obj["__class__"]]
+            return tuple(obj.get(attr, getattr(cls, attr, None))
+                         for attr in foreign_keys.get(cls.__name__, ()))
+        return tuple(getattr(obj, attr, None)
+                     for attr in foreign_keys.get(obj.__class__.__name__, ()))
+
+    def __index(self, key, values=None):
+        """files key in the foreign key indexes under values, or removes it
+        from them if values is None"""
+        name = key.split(".")[0]
+        old = self.__ref_values.pop(key, None)
+        for i, attr in enumerate(foreign_keys.get(name, ())):
+            refs = self.__refs.setdefault((name, attr), {})
+            if old is not None and old[i] in refs:
+                refs[old[i]].pop(key, None)
+                if not refs[old[i]]:
+                    del refs[old[i]]
+                self.__file((name, attr, old[i]), key, False)
+            if values is not None:
+                refs.setdefault(values[i], {})[key] = None
+                self.__file((name, attr, values[i]), key)
+        if values is not None and name in foreign_keys:
+            self.__ref_values[key] = values
+
+    def __sort(self, key, present=True):
+        """files the id of key in the ordered index of its class, or removes
+        it from the index unless present"""
+        self.__file(key.split(".")[0], key, present)
+
+    def __file(self, index, key, present=True):
+        """files the id of key as added to the ordered index index, if it
+        was built, or as removed from it unless present"""
+        ids = self.__order.get(index)
+        if ids is None:
+            return
+        id = key.split(".", 1)[1]
+        i = bisect.bisect_left(ids, id)
+        found = i < len(ids) and ids[i] == id
+        added, removed = self.__unsorted.setdefault(index, (set(), set()))
+        if present:
+            removed.discard(id)
+            if not found:
+                added.add(id)
+        else:
+            added.discard(id)
+            if found:
+                removed.add(id)
+
+    def __page(self, name, ids, limit, after):
+        """returns the objects of the first limit ids of ids, which are
+        sorted, that come after the id after, by key"""
+        start = 0 if after is None else bisect.bisect_right(ids, after)
+        stop = None if limit is None else start + limit
+        waiting = self.__waiting(name)
+        page = {}
+        for id in ids[start:stop]:
+            key = name + "." + id
+            if key in waiting:
+                self.__build(key, waiting.pop(key))
+            page[key] = self.__objects[key]
+        return page
+
+    def __paged(self, pages, limit):
+        """returns the first limit objects of pages, the pages of several
+        classes, in the order of their ids"""
+        objs = sorted((obj for page in pages for obj in page.items()),
+                      key=lambda item: item[1].id)
+        return dict(objs[:limit])
+
+    def __build(self, key, record):
+        """builds and stores the object of a record, which shares its key
+        and foreign key values with it, but not its lists, which objects
+        copy"""
+        obj = classes[record["__class__"]](**record)
+        for attr in foreign_keys.get(record["__class__"], ()):
+            if attr in record:
+                record[attr] = getattr(obj, attr)
+        if key in self.__records:
+            self.__records[key] = self.__records.pop(key)
+        self.__add(key, obj)
+
+    def all(self, cls=None, load=None, limit=None, after=None):
+        """
+        returns the dictionary __objects, or the first limit objects whose
+        id comes after the id after, in the order of their ids; load is
+        accepted for DBStorage compatibility: relationships are looked up
+        in the indexes
+        """
+        with self.__lock:
+            if limit is not None or after is not None:
+                if cls is not None:
+                    return self.__paged([self.__ordered(cls, limit, after)],
+                                        limit)
+                return self.__paged([self.__ordered(name, limit, after)
+                                     for name in classes], limit)
+            if cls is not None:
+                waiting = self.__waiting(cls)
+                while waiting:
+                    self.__build(*waiting.popitem())
+                return dict(self.__bucket(cls))
+            for waiting in self.__pending.values():
+                while waiting:
+                    self.__build(*waiting.popitem())
+            return self.__objects
+
+    def iter(self, cls=None, batch_size=1000):
+        """
+        yields the objects of cls, or of every class, in the order of their
+        ids, looking the next batch_size ids up in the ordered index of
+        their class at a time, so that objects may be added or deleted
+        while they are walked. The records not built yet are built into
+        objects that are not stored, so that a scan does not build the
+        whole class: they are copies, and changing one changes nothing
+        that is saved; get() returns the object to change.
+        """
+        if cls is None:
+            names = list(classes)
+        else:
+            names = [cls if type(cls) is str else cls.__name__]
+        for name in names:
+            after = None
+            while True:
+                with self.__lock:
+                    ids = self.__ids(name)
+                    start = 0
+                    if after is not None:
+                        start = bisect.bisect_right(ids, after)
+                    batch = ids[start:start + batch_size]
+                    waiting = self.__waiting(name)
+                if not batch:
+                    break
+                after = batch[-1]
+                for id in batch:
+                    key = name + "." + id
+                    with self.__lock:
+                        record = waiting.get(key)
+                        if record is not None:
+                            record = self.__detached(record)
+                        obj = self.__objects.get(key)
+                    if record is not None:
+                        yield classes[name](**record)
+                    elif obj is not None:
+                        yield obj
+
+    def __detached(self, record):
+        """returns a copy of record that shares none of its lists"""
+        return {name: list(value) if type(value) is list else value
+                for name, value in record.items()}
+
+    def __ordered(self, cls, limit, after):
+        """returns the first limit objects of cls whose id comes after the id
+        after, looked up in the ordered index of cls"""
+        name = cls if type(cls) is str else cls.__name__
+        return self.__page(name, self.__ids(name), limit, after)
+
+    def __ids(self, name, attr=None, value=None):
+        """returns the ordered index of the class name, or of its objects
+        whose foreign key attr is value, built the first time it is paged
+        through"""
+        bucket = self.__bucket(name)
+        index = name if attr is None else (name, attr, value)
+        if index not in self.__order:
+            if attr is None:
+                keys = list(bucket) + list(self.__waiting(name))
+            else:
+                keys = self.__refs.get((name, attr), {}).get(value, ())
+            self.__order[index] = sorted(set(k[len(name) + 1:]
+                                             for k in keys))
+        if index in self.__unsorted:
+            added, removed = self.__unsorted.pop(index)
+            ids = self.__order[index]
+            if removed:
+                ids = [id for id in ids if id not in removed]
+            # sorts in linear time the sorted ids followed by a few others
+            ids.extend(added)
+            ids.sort()
+            self.__order[index] = ids
+        return self.__order[index]
 
     def new(self, obj):
         """sets in __objects the obj with key <obj class name>.id"""
-        if obj is not None:
-            key = obj.__class__.__name__ + "." + obj.id
-            self.__objects[key] = obj
+        with self.__lock:
+            if obj is not None:
+                key = obj.__class__.__name__ + "." + obj.id
+                self.__add(key, obj)
+                self.__changed(key)
+
+    def bulk_new(self, objs):
+        """sets in __objects every object of objs, then saves them all in a
+        single write"""
+        with self.__lock:
+            for obj in objs:
+                self.new(obj)
+            self.save()
+
+    def __add(self, key, obj):
+        """stores obj under key"""
+        self.__waiting(obj.__class__).pop(key, None)
+        self.__bucket(obj.__class__)[key] = obj
+        self.__objects[key] = obj
+        self.__index(key, self.__fk_values(obj))
+        self.__sort(key)
+
+    def __changed(self, key):
+        """marks key as changed since the last save, and since the start of
+        the batch() block the thread runs"""
+        self.__dirty[key] = None
+        if getattr(self.__batching, "depth", 0):
+            self.__batching.keys[key] = None
+
+    def touch(self, obj, name):
+        """marks obj as changed since the last save after its attribute name
+        was set, deleted or changed in place, and moves it in the foreign key
+        indexes if name is a foreign key"""
+        with self.__lock:
+            id = getattr(obj, "id", None)
+            if id is None:
+                return
+            key = obj.__class__.__name__ + "." + id
+            if self.__objects.get(key) is obj:
+                self.__changed(key)
+                if name.endswith("_id"):
+                    self.__bucket(obj.__class__)
+                    self.__index(key, self.__fk_values(obj))
+
+    def find(self, cls, attr, value, limit=None, after=None):
+        """returns the list of the objects of cls whose attr is value,
+        looked up in the foreign key indexes when attr is one of them, or
+        the first limit of them whose id comes after the id after"""
+        with self.__lock:
+            name = cls.__name__
+            paged = limit is not None or after is not None
+            if attr not in foreign_keys.get(name, ()):
+                if not paged:
+                    return [obj for obj in self.all(cls).values()
+                            if getattr(obj, attr, None) == value]
+                return self.__scan(cls, attr, value, limit, after)
+            if paged:
+                ids = self.__ids(name, attr, value)
+                return list(self.__page(name, ids, limit, after).values())
+            self.__bucket(name)
+            keys = list(self.__refs.get((name, attr), {}).get(value, ()))
+            waiting = self.__waiting(name)
+            for key in keys:
+                if key in waiting:
+                    self.__build(key, waiting.pop(key))
+            return [self.__objects[key] for key in keys]
+
+    def __scan(self, cls, attr, value, limit, after):
+        """returns the first limit objects of cls whose attr is value and
+        whose id comes after the id after, walking the ordered index of cls
+        from after until it has them"""
+        name = cls.__name__
+        ids = self.__ids(name)
+        waiting = self.__waiting(name)
+        objs = []
+        start = 0 if after is None else bisect.bisect_right(ids, after)
+        for i in range(start, len(ids)):
+            if limit is not None and len(objs) >= limit:
+                break
+            key = name + "." + ids[i]
+            record = waiting.get(key)
+            if record is not None:
+                if record.get(attr, getattr(cls, attr, None)) == value:
+                    self.__build(key, waiting.pop(key))
+                    objs.append(self.__objects[key])
+            elif getattr(self.__objects[key], attr, None) == value:
+                objs.append(self.__objects[key])
+        return objs
 
     def save(self):
         """serializes __objects to the JSON file (path: __file_path)"""
-        json_objects = {}
-        for key in self.__objects:
-            if key == "password":
-                json_objects[key].decode()
-            json_objects[key] = self.__objects[key].to_dict(save_fs=1)
-        with open(self.__file_path, 'w') as f:
-            json.dump(json_objects, f)
+        with self.__lock:
+            batching = getattr(self.__batching, "depth", 0)
+            if batching or self.__flush_window > 0:
+                FileStorage.__deferred = True
+                if not batching and self.__flusher is None:
+                    FileStorage.__flusher = threading.Timer(
+                        self.__flush_window, self.flush)
+                    self.__flusher.start()
+                return
+            self.__write()
+
+    @contextmanager
+    def batch(self):
+        """
+        defers every save the thread makes until the end of the block, then
+        writes once; if the block raises, the objects it changed are put
+        back as they were last saved instead
+        """
+        batching = self.__batching
+        if not getattr(batching, "depth", 0):
+            batching.depth, batching.keys = 0, {}
+        batching.depth += 1
+        try:
+            yield self
+        except BaseException:
+            batching.depth -= 1
+            keys, batching.keys = batching.keys, {}
+            with self.__lock:
+                self.__rollback(keys)
+            raise
+        batching.depth -= 1
+        if not batching.depth:
+            self.flush()
+
+    def __rollback(self, keys):
+        """puts the objects of keys back as they are in the files, removing
+        those that are not"""
+        with self.__locked(fcntl.LOCK_SH):
+            self.__refresh()
+            records = self.__read()
+        for key in keys:
+            obj = self.__objects.get(key)
+            if obj is not None:
+                self.delete(obj)
+            if key in records:
+                self.__build(key, records[key])
+
+    def flush(self):
+        """writes the objects if a save was deferred"""
+        with self.__lock:
+            if self.__flusher is not None:
+                self.__flusher.cancel()
+                FileStorage.__flusher = None
+            if self.__deferred:
+                FileStorage.__deferred = False
+                try:
+                    self.__write()
+                except BaseException:
+                    FileStorage.__deferred = True
+                    raise
+
+    def __write(self):
+        """
+        writes the objects to the files, after merging what other processes
+        wrote since the last read or write into the objects left unchanged;
+        if that fails, the changes are kept for the next save
+        """
+        with self.__locked(fcntl.LOCK_EX):
+            dirty, tracked, saved = self.__dirty, self.__tracked, {}
+            try:
+                self.__write_changes(saved)
+            except BaseException:
+                for key, record in saved.items():
+                    if record is None:
+                        self.__records.pop(key, None)
+                    else:
+                        self.__records[key] = record
+                dirty.update(self.__dirty)
+                FileStorage.__dirty = dirty
+                FileStorage.__tracked = tracked
+                raise
+
+    def __write_changes(self, saved):
+        """writes the changes to the files, with the lock file held, filing
+        the records they replace in saved by key, None for the keys that had
+        none"""
+        changes = self.__changes(saved)
+        self.__refresh(changes)
+        path = self.__file_path if self.__shards is None else self.__shards
+        if not changes and os.path.exists(path) and (
+                self.__journal or not os.path.exists(self.__journal_path)):
+            return
+        if self.__journal:
+            self.__append(changes)
+        elif self.__shards is not None:
+            self.__save_shards(changes)
+        else:
+            records = self.__current(classes, changes)
+            os.replace(self.__dump(self.__file_path, records),
+                       self.__file_path)
+            self.__truncate()
+        self.__bump()
+        if self.__journal_pos > self.__journal_max and \
+           not self.__compacting:
+            FileStorage.__compacting = True
+            threading.Thread(target=self.compact).start()
+
+    def __truncate(self):
+        """drops the journal once the files hold every record"""
+        if os.path.exists(self.__journal_path):
+            os.remove(self.__journal_path)
+        FileStorage.__journal_pos = 0
+
+    def __changes(self, saved):
+        """
+        returns the records changed since the last save by key, with None
+        for the deleted ones, and brings __records up to date, filing the
+        fingerprints it replaces in saved by key. Only the
+        dirty objects are compared to their records, unless __objects was
+        replaced since the last save: their lists tell them when they are
+        changed in place.
+        """
+        dirty = self.__dirty
+        FileStorage.__dirty = {}
+        if self.__tracked is not self.__objects:
+            FileStorage.__tracked = self.__objects
+            dirty = list(self.__objects)
+            dirty += [k for k in self.__records if k not in self.__objects]
+        changes = {}
+        for key in dirty:
+            obj = self.__objects.get(key)
+            if obj is not None:
+                record = obj.to_dict(save_fs=1)
+                mark = fingerprint(record)
+                if self.__records.get(key) != mark:
+                    saved[key] = self.__records.get(key)
+                    self.__records[key] = mark
+                    changes[key] = record
+            elif key in self.__records and \
+                    key not in self.__waiting(key.split(".")[0]):
+                saved[key] = self.__records.pop(key)
+                changes[key] = None
+        return changes
+
+    def __save_shards(self, changes):
+        """rewrites the shards of the classes that have changed objects"""
+        names = {key.split(".")[0] for key in changes}
+        if not self.__sharded():
+            names.update(self.__classes, self.__pending)
+        records = self.__current(names, changes)
+        shards = {name: {} for name in names}
+        for key, record in records.items():
+            shards[key.split(".")[0]][key] = record
+        self.__write_shards(shards)
+        self.__truncate()
+
+    def __current(self, names, changes):
+        """returns the records of the objects of the classes in names, as
+        they are saved, by key, reusing those in changes"""
+        records = {}
+        for name in names:
+            for key, obj in self.__bucket(name).items():
+                record = changes.get(key)
+                records[key] = obj.to_dict(save_fs=1) if record is None \
+                    else record
+            records.update(self.__waiting(name))
+        return records
+
+    def __append(self, changes):
+        """appends the records changed since the last save to the journal"""
+        lines = []
+        for key, record in changes.items():
+            lines.append(json.dumps([key, record]))
+        if lines:
+            with open(self.__journal_path, 'a') as f:
+                f.write("\n".join(lines) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+                FileStorage.__journal_pos = f.tell()
+
+    def compact(self):
+        """folds the journal back into the JSON file, or the shards"""
+        with self.__locked(fcntl.LOCK_EX):
+            self.__refresh()
+            records = self.__read()
+            pos = self.__journal_pos
+            stamp = self.__stamp
+        try:
+            if self.__shards is not None:
+                shards = {}
+                if self.__sharded():
+                    shards = {name: {} for name in self.__shard_paths()}
+                for key, record in records.items():
+                    shards.setdefault(key.split(".")[0], {})[key] = record
+            else:
+                tmp = self.__dump(self.__file_path, records)
+            with self.__locked(fcntl.LOCK_EX):
+                self.__refresh()
+                if self.__stamp[0] != stamp[0]:
+                    if self.__shards is None:
+                        os.remove(tmp)
+                    return
+                if self.__shards is not None:
+                    self.__write_shards(shards)
+                else:
+                    os.replace(tmp, self.__file_path)
+                try:
+                    with open(self.__journal_path, 'rb') as f:
+                        f.seek(pos)
+                        rest = f.read()
+                except FileNotFoundError:
+                    rest = b""
+                tmp = "{}.{}.tmp".format(self.__journal_path, os.getpid())
+                with open(tmp, 'wb') as f:
+                    f.write(rest)
+                os.replace(tmp, self.__journal_path)
+                FileStorage.__journal_pos = max(self.__journal_pos - pos, 0)
+                self.__bump()
+        finally:
+            FileStorage.__compacting = False
+
+    def __replay(self, pos):
+        """returns the [key, record] entries of the journal from offset pos,
+        where a record of None means the object was deleted"""
+        entries = []
+        try:
+            with open(self.__journal_path, 'rb') as f:
+                f.seek(pos)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    pos += len(line)
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            pos = 0
+        FileStorage.__journal_pos = pos
+        return entries
+
+    def __read(self):
+        """returns the records of the files with the journal replayed on
+        them, by key, with the lock file held once __refresh() has read the
+        journal to its end"""
+        jo = self.__load()
+        for key, record in self.__replay(0):
+            if record is None:
+                jo.pop(key, None)
+            else:
+                jo[key] = record
+        return jo
+
+    def __merge(self, key, record):
+        """brings the object stored under key in line with its record"""
+        waiting = self.__waiting(key.split(".")[0])
+        if record is None:
+            self.__records.pop(key, None)
+            if waiting.pop(key, None) is not None:
+                self.__index(key)
+                self.__sort(key, False)
+            if key in self.__objects:
+                self.delete(self.__objects[key])
+            return
+        record["__class__"] = classes[record["__class__"]].__name__
+        mark = fingerprint(record)
+        if self.__records.get(key) != mark:
+            self.__records[key] = mark
+            if not self.__lazy:
+                self.__build(key, record)
+                return
+            if key in self.__objects:
+                self.delete(self.__objects[key])
+            waiting[key] = record
+            self.__bucket(key.split(".")[0])
+            self.__index(key, self.__fk_values(record))
+            self.__sort(key)
 
     def reload(self):
-        """deserializes the JSON file to __objects"""
+        """
+        deserializes the JSON file, or the shards, and the journal to
+        __objects, skipping them if they have not changed and only
+        rebuilding the objects whose record did
+        """
         try:
-            with open(self.__file_path, 'r') as f:
-                jo = json.load(f)
-            for key in jo:
-                self.__objects[key] = classes[jo[key]["__class__"]](**jo[key])
+            with self.__lock:
+                if self.__stat() == FileStorage.__stamp:
+                    return
+                with self.__locked(fcntl.LOCK_SH):
+                    self.__refresh()
         except:
             pass
 
+    def __refresh(self, keep=()):
+        """
+        merges the records written since the last read or write into the
+        objects, but those whose key is in keep
+        """
+        stamp = self.__stat()
+        old = FileStorage.__stamp
+        if stamp == old:
+            return
+        if old is not None and stamp[0] == old[0] and \
+           stamp[1] is not None and \
+           (old[1] is None or stamp[1][2] == old[1][2]) and \
+           stamp[1][1] >= self.__journal_pos:
+            # the journal is only ever appended to
+            for key, record in self.__replay(self.__journal_pos):
+                if key not in keep:
+                    self.__merge(key, record)
+        else:
+            jo = self.__read()
+            for key in [k for k in self.__records if k not in jo]:
+                if key not in keep:
+                    self.__merge(key, None)
+            for key in jo:
+                if key not in keep:
+                    self.__merge(key, jo[key])
+        FileStorage.__stamp = stamp
+
     def delete(self, obj=None):
         """delete obj from __objects if it’s inside"""
-        if obj is not None:
-            key = obj.__class__.__name__ + '.' + obj.id
-            if key in self.__objects:
-                del self.__objects[key]
+        with self.__lock:
+            if obj is not None:
+                key = obj.__class__.__name__ + '.' + obj.id
+                if key in self.__objects:
+                    del self.__objects[key]
+                    self.__bucket(obj.__class__).pop(key, None)
+                    self.__index(key)
+                    self.__sort(key, False)
+                    self.__changed(key)
 
     def close(self):
-        """call reload() method for deserializing the JSON file to objects"""
+        """call reload() method to pick up changes made to the JSON file"""
         self.reload()
 
-    def get(self, cls, id):
+    def get(self, cls, id, load=None):
         """
         Returns -> object based on the class name and its ID,
-        orNone if not found
+        orNone if not found or if the ID is not a string, load is accepted
+        for DBStorage compatibility
         """
-        if cls not in classes.values():
-            return None
+        with self.__lock:
+            if cls not in classes.values() or type(id) is not str:
+                return None
 
-        all_Clss = models.storage.all(cls)
-        for value in all_Clss.values():
-            if (value.id == id):
-                return value
-
-        return None
+        key = cls.__name__ + "." + id
+        waiting = self.__waiting(cls)
+        if key in waiting:
+            self.__build(key, waiting.pop(key))
+        return self.__objects.get(key)
 
     def count(self, cls=None):
         """
         Ti count the nbr of objects in the storage
         """
-        all_Clss = classes.values()
-
-        if not cls:
-            count = 0
-            for clss in all_Clss:
-                count += len(models.storage.all(clss).values())
-        else:
-            count = len(models.storage.all(cls).values())
+        with self.__lock:
+            if not cls:
+                count = len(self.__objects)
+                for waiting in self.__pending.values():
+                    count += len(waiting)
+                return count
+            return len(self.__bucket(cls)) + len(self.__waiting(cls))
 
-        return count
+    def counts(self, clss=None):
+        """
+        returns the number of objects of each class of clss, or of every
+        class, by class name, 0 for the names of no class
+        """
+        if clss is None:
+            clss = classes.values()
+        counts = {}
+        for cls in clss:
+            cls = classes.get(cls, cls)
+            if cls in classes.values():
+                counts[cls.__name__] = self.count(cls)
+            else:
+                counts[getattr(cls, "__name__", cls)] = 0
+        return counts
@@ -0,0 +1,82 @@
+#!/usr/bin/python3
+"""
+Contains the versioned migrations of the database schema of DBStorage
+
+The n-th migration upgrades the schema to version n, and the version a
+database is at is kept in the hbnb_schema table. upgrade() runs the
+migrations a database has not had yet, so that a database created by an
+older version of the models, like the ones set up with setup_mysql_dev.sql,
+is upgraded in place. Migrations must be idempotent: a new database gets the
+current schema from create_all() and then runs all of them. They must not
+read the models either, which describe the latest version only: what a
+migration changes is written out in it.
+"""
+
+from contextlib import contextmanager
+from sqlalchemy import Column, Index, Integer, MetaData, Table
+from sqlalchemy import insert, select, update
+
+# the table holding the version of the schema, kept out of Base.metadata
+schema = Table('hbnb_schema', MetaData(),
+               Column('version', Integer, nullable=False))
+
+# the indexes of version 1, as (table, index, columns)
+indexes_v1 = [
+    ('cities', 'ix_cities_state_id', ('state_id', 'id')),
+    ('places', 'ix_places_city_id', ('city_id', 'id')),
+    ('places', 'ix_places_user_id', ('user_id', 'id')),
+    ('places', 'ix_places_price_by_night', ('price_by_night',)),
+    ('places', 'ix_places_location', ('latitude', 'longitude')),
+    ('reviews', 'ix_reviews_place_id', ('place_id', 'id')),
+    ('reviews', 'ix_reviews_user_id', ('user_id', 'id')),
+    ('users', 'ix_users_email', ('email',)),
+    ('place_amenity', 'ix_place_amenity_amenity_id', ('amenity_id',)),
+]
+
+
+def create_indexes(conn):
+    """creates the indexes of version 1 that are missing"""
+    for table, name, columns in indexes_v1:
+        table = Table(table, MetaData(), *[Column(c) for c in columns])
+        index = Index(name, *[table.c[c] for c in columns])
+        index.create(conn, checkfirst=True)
+
+
+# list - the migrations, in the order of the versions they upgrade to
+migrations = [create_indexes]
+
+
+@contextmanager
+def locked(conn):
+    """
+    holds a lock on the database of conn until the end of the block, so
+    that workers starting together upgrade it one after the other: an
+    advisory lock for MySQL, a write transaction for SQLite
+    """
+    if conn.dialect.name == "mysql":
+        if not conn.exec_driver_sql(
+                "SELECT GET_LOCK('hbnb_schema', 60)").scalar():
+            raise RuntimeError("timed out waiting for the schema lock")
+        try:
+            yield
+        finally:
+            conn.exec_driver_sql("SELECT RELEASE_LOCK('hbnb_schema')")
+        return
+    if conn.dialect.name == "sqlite":
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+    yield
+
+
+def upgrade(engine):
+    """runs the migrations the database of engine has not had, returns the
+    version of its schema"""
+    with engine.begin() as conn, locked(conn):
+        schema.create(conn, checkfirst=True)
+        current = conn.execute(select(schema.c.version)).scalar()
+        if current is None:
+            current = 0
+            conn.execute(insert(schema).values(version=current))
+        for n in range(current, len(migrations)):
+            migrations[n](conn)
+            conn.execute(update(schema).values(version=n + 1))
+    return max(current, len(migrations))
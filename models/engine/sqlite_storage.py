@@ -0,0 +1,39 @@
+#!/usr/bin/python3
+"""
+Contains the class SQLiteStorage
+"""
+
+from models.engine.db_storage import DBStorage, pool_options
+from os import getenv
+from sqlalchemy import create_engine, event
+
+
+def set_pragmas(dbapi_connection, connection_record):
+    """sets up every new connection to the SQLite database"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+class SQLiteStorage(DBStorage):
+    """interacts with a local SQLite database, in write-ahead log mode"""
+
+    def _create_engine(self, path=None):
+        """returns the engine of the SQLite database at path, or at
+        HBNB_SQLITE_PATH"""
+        HBNB_SQLITE_PATH = path or getenv('HBNB_SQLITE_PATH', 'hbnb.db')
+        engine = create_engine('sqlite:///{}'.format(HBNB_SQLITE_PATH),
+                               connect_args={"check_same_thread": False},
+                               **pool_options())
+        event.listen(engine, "connect", set_pragmas)
+        return engine
+
+    def _create_replicas(self):
+        """returns the engines of the read replicas of the SQLite database,
+        at the comma-separated paths of HBNB_SQLITE_REPLICA_PATHS"""
+        paths = getenv('HBNB_SQLITE_REPLICA_PATHS')
+        if not paths:
+            return []
+        return [self._create_engine(path) for path in paths.split(",")]
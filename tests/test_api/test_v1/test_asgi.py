@@ -0,0 +1,153 @@
+#!/usr/bin/python3
+"""
+Contains the TestAsgiDocs and TestAsgi classes
+"""
+
+import asyncio
+import json
+import models
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+import pep8
+import time
+import unittest
+try:
+    from api.v1 import asgi
+except ImportError:
+    asgi = None
+
+
+async def call(method, path, body=b""):
+    """returns the status and the body messages of the response of
+    asgi_app to the request"""
+    scope = {"type": "http", "method": method, "path": path,
+             "query_string": b"", "http_version": "1.1", "root_path": "",
+             "headers": [(b"content-type", b"application/json"),
+                         (b"content-length", str(len(body)).encode())]}
+
+    async def receive():
+        """the body of the request, in one message"""
+        return {"type": "http.request", "body": body}
+    messages = []
+
+    async def send(message):
+        """keeps the messages of the response"""
+        messages.append(message)
+    await asgi.asgi_app(scope, receive, send)
+    return messages[0]["status"], [m.get("body", b"") for m in messages[1:]]
+
+
+class TestAsgiDocs(unittest.TestCase):
+    """Tests to check the documentation and style of api/v1/asgi.py"""
+
+    def test_pep8_conformance_asgi(self):
+        """Test that api/v1/asgi.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/asgi.py',
+                                    'tests/test_api/test_v1/test_asgi.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    @unittest.skipIf(asgi is None, "asgiref missing")
+    def test_asgi_module_docstring(self):
+        """Test for the asgi.py module docstring"""
+        self.assertTrue(asgi.__doc__ and len(asgi.__doc__) >= 1,
+                        "asgi.py needs a docstring")
+
+
+@unittest.skipIf(asgi is None, "asgiref missing")
+@unittest.skipIf(models.async_storage is None, "HBNB_ASYNC=1 not set")
+class TestAsgi(unittest.TestCase):
+    """Test that asgi_app serves the async views on its event loop"""
+
+    def setUp(self):
+        """Create a place"""
+        self.state = State(name="Asgi")
+        self.city = City(name="Asgi", state_id=self.state.id)
+        self.user = User(email="asgi@hbnb.io", password="asgi")
+        self.place = Place(name="Asgi", city_id=self.city.id,
+                           user_id=self.user.id)
+        self.objs = [self.state, self.city, self.user, self.place]
+        models.storage.bulk_new(self.objs)
+
+    def tearDown(self):
+        """Remove the objects created by setUp"""
+        for obj in reversed(self.objs):
+            models.storage.delete(obj)
+        models.storage.save()
+
+    def test_views(self):
+        """Test that async and sync views respond like under WSGI"""
+        status, body = asyncio.run(call("GET", "/api/v1/status"))
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(b"".join(body)), {"status": "OK"})
+        path = "/api/v1/states/" + self.state.id
+        status, body = asyncio.run(call("GET", path))
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(b"".join(body))["name"], "Asgi")
+        status, body = asyncio.run(call("GET", "/api/v1/states/nope"))
+        self.assertEqual(status, 404)
+        self.assertEqual(json.loads(b"".join(body)), {"error": "Not found"})
+
+    def test_wsgi_views(self):
+        """Test that the sync views are served through WsgiToAsgi"""
+        status, body = asyncio.run(call("GET",
+                                        "/api/v1/places/" + self.place.id))
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(b"".join(body))["name"], "Asgi")
+        body = json.dumps({"name": "Renamed"}).encode()
+        status, body = asyncio.run(call("PUT", "/api/v1/states/" +
+                                        self.state.id, body))
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(b"".join(body))["name"], "Renamed")
+        status, body = asyncio.run(call("GET", "/api/v1/nope"))
+        self.assertEqual(status, 404)
+
+    def test_multiplexed(self):
+        """Test that requests waiting on the database are served together"""
+        counts = models.async_storage.counts
+
+        async def slow(classes):
+            """counts, after a slow query"""
+            await asyncio.sleep(0.2)
+            return await counts(classes)
+
+        async def stats():
+            """requests /stats 10 times at once"""
+            return await asyncio.gather(*[call("GET", "/api/v1/stats")
+                                          for _ in range(10)])
+        models.async_storage.counts = slow
+        try:
+            start = time.perf_counter()
+            responses = asyncio.run(stats())
+            elapsed = time.perf_counter() - start
+        finally:
+            del models.async_storage.counts
+        self.assertEqual([status for status, _ in responses], [200] * 10)
+        self.assertLess(elapsed, 1)
+
+    def test_places_search_streamed(self):
+        """Test that places_search without filters sends every place, in
+        chunks"""
+        status, body = asyncio.run(call("POST", "/api/v1/places_search",
+                                        b"{}"))
+        self.assertEqual(status, 200)
+        self.assertGreater(len(body), 1)
+        places = json.loads(b"".join(body))
+        self.assertEqual(len(places), models.storage.count(Place))
+        self.assertIn(self.place.id, [place["id"] for place in places])
+        body = json.dumps({"states": [self.state.id]}).encode()
+        status, body = asyncio.run(call("POST", "/api/v1/places_search",
+                                        body))
+        self.assertEqual([place["id"] for place in json.loads(b"".join(body))],
+                         [self.place.id])
+
+    def test_places_search_wsgi(self):
+        """Test that the async places_search sends every place under WSGI,
+        which does not send async bodies"""
+        client = asgi.my_App.test_client()
+        resp = client.post("/api/v1/places_search", json={})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(resp.json), models.storage.count(Place))
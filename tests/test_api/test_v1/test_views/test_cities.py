@@ -0,0 +1,79 @@
+#!/usr/bin/python3
+"""
+Contains the TestCitiesDocs and TestCitiesPost classes
+"""
+
+from api.v1.app import my_App
+from api.v1.views import cities
+import models
+from models.city import City
+from models.state import State
+import pep8
+import unittest
+
+
+class TestCitiesDocs(unittest.TestCase):
+    """Tests to check the style of the City views"""
+
+    def test_pep8_conformance_cities(self):
+        """Test that api/v1/views/cities.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/cities.py',
+                                    'tests/test_api/test_v1/test_views/\
+test_cities.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_cities_module_docstring(self):
+        """Test for the cities.py module docstring"""
+        self.assertTrue(cities.__doc__ and len(cities.__doc__) >= 1,
+                        "cities.py needs a docstring")
+
+
+class TestCitiesPost(unittest.TestCase):
+    """Test that POST /states/<state_id>/cities creates one city or a list
+    of them"""
+
+    def setUp(self):
+        """Set up a test client and a state"""
+        self.client = my_App.test_client()
+        self.state = State(name="Posted")
+        self.state.save()
+        self.state_id = self.state.id
+        self.url = '/api/v1/states/{}/cities'.format(self.state_id)
+
+    def tearDown(self):
+        """Remove the state and its cities"""
+        models.storage.close()
+        for city in models.storage.find(City, "state_id", self.state_id):
+            models.storage.delete(city)
+        models.storage.delete(models.storage.get(State, self.state_id))
+        models.storage.save()
+
+    def test_post_list(self):
+        """Test that every city of a list belongs to the state of the URL"""
+        body = [{"name": "One", "state_id": "elsewhere"}, {"name": "Two"}]
+        resp = self.client.post(self.url, json=body)
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual([obj["name"] for obj in resp.json], ["One", "Two"])
+        for obj in resp.json:
+            self.assertEqual(obj["state_id"], self.state_id)
+        found = models.storage.find(City, "state_id", self.state_id)
+        self.assertEqual(len(found), 2)
+
+    def test_post_list_all_or_nothing(self):
+        """Test that a list with an invalid object creates no city"""
+        resp = self.client.post(self.url, json=[{"name": "One"}, {}])
+        self.assertEqual(resp.status_code, 400)
+        resp = self.client.post(self.url, json=[{"name": "One"}, {"a": 1}])
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn(b"Missing name", resp.data)
+        self.assertEqual(
+            models.storage.find(City, "state_id", self.state_id), [])
+
+    def test_post_list_unknown_state(self):
+        """Test that a list posted to an unknown state is not found"""
+        resp = self.client.post('/api/v1/states/nope/cities',
+                                json=[{"name": "One"}])
+        self.assertEqual(resp.status_code, 404)
+        self.assertEqual(resp.json, {"error": "Not found"})
@@ -0,0 +1,85 @@
+#!/usr/bin/python3
+"""
+Contains the TestPlacesDocs and TestPlacesPost classes
+"""
+
+from api.v1.app import my_App
+from api.v1.views import places
+import models
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+import pep8
+import unittest
+
+
+class TestPlacesDocs(unittest.TestCase):
+    """Tests to check the style of the Place views"""
+
+    def test_pep8_conformance_places(self):
+        """Test that api/v1/views/places.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/places.py',
+                                    'tests/test_api/test_v1/test_views/\
+test_places.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_places_module_docstring(self):
+        """Test for the places.py module docstring"""
+        self.assertTrue(places.__doc__ and len(places.__doc__) >= 1,
+                        "places.py needs a docstring")
+
+
+class TestPlacesPost(unittest.TestCase):
+    """Test that POST /cities/<city_id>/places creates one place or a list
+    of them"""
+
+    def setUp(self):
+        """Set up a test client, a city and a user"""
+        self.client = my_App.test_client()
+        self.state = State(name="Posted")
+        self.city = City(name="Posted", state_id=self.state.id)
+        self.user = User(email="posted@hbnb.io", password="posted")
+        models.storage.bulk_new([self.state, self.city, self.user])
+        self.ids = (self.state.id, self.city.id, self.user.id)
+        self.url = '/api/v1/cities/{}/places'.format(self.city.id)
+
+    def tearDown(self):
+        """Remove the city, the user and their places"""
+        models.storage.close()
+        state_id, city_id, user_id = self.ids
+        for place in models.storage.find(Place, "city_id", city_id):
+            models.storage.delete(place)
+        models.storage.delete(models.storage.get(City, city_id))
+        models.storage.delete(models.storage.get(State, state_id))
+        models.storage.delete(models.storage.get(User, user_id))
+        models.storage.save()
+
+    def test_post_list(self):
+        """Test that every place of a list belongs to the city of the URL"""
+        body = [{"name": "One", "user_id": self.user.id},
+                {"name": "Two", "user_id": self.user.id}]
+        resp = self.client.post(self.url, json=body)
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual([obj["name"] for obj in resp.json], ["One", "Two"])
+        for obj in resp.json:
+            self.assertEqual(obj["city_id"], self.city.id)
+        found = models.storage.find(Place, "city_id", self.city.id)
+        self.assertEqual(len(found), 2)
+
+    def test_post_user_id_not_string(self):
+        """Test that a user_id that is not a string is not found, in a list
+        or a single object, and creates no place"""
+        for user_id in (5, None, [self.user.id], {"id": self.user.id}):
+            with self.subTest(user_id=user_id):
+                body = {"name": "One", "user_id": user_id}
+                resp = self.client.post(self.url, json=body)
+                self.assertEqual(resp.status_code, 404)
+                good = {"name": "Two", "user_id": self.user.id}
+                resp = self.client.post(self.url, json=[good, body])
+                self.assertEqual(resp.status_code, 404)
+                self.assertEqual(resp.json, {"error": "Not found"})
+        self.assertEqual(
+            models.storage.find(Place, "city_id", self.city.id), [])
@@ -0,0 +1,90 @@
+#!/usr/bin/python3
+"""
+Contains the TestReviewsDocs and TestReviewsPost classes
+"""
+
+from api.v1.app import my_App
+from api.v1.views import places_reviews
+import models
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+import pep8
+import unittest
+
+
+class TestReviewsDocs(unittest.TestCase):
+    """Tests to check the style of the Review views"""
+
+    def test_pep8_conformance_places_reviews(self):
+        """Test that api/v1/views/places_reviews.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/places_reviews.py',
+                                    'tests/test_api/test_v1/test_views/\
+test_places_reviews.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_places_reviews_module_docstring(self):
+        """Test for the places_reviews.py module docstring"""
+        self.assertTrue(places_reviews.__doc__ and
+                        len(places_reviews.__doc__) >= 1,
+                        "places_reviews.py needs a docstring")
+
+
+class TestReviewsPost(unittest.TestCase):
+    """Test that POST /places/<place_id>/reviews creates one review or a
+    list of them"""
+
+    def setUp(self):
+        """Set up a test client, a place and a user"""
+        self.client = my_App.test_client()
+        state = State(name="Posted")
+        city = City(name="Posted", state_id=state.id)
+        self.user = User(email="posted@hbnb.io", password="posted")
+        self.place = Place(name="Posted", city_id=city.id,
+                           user_id=self.user.id)
+        self.objs = [state, city, self.user, self.place]
+        models.storage.bulk_new(self.objs)
+        self.keys = [(obj.__class__, obj.id) for obj in self.objs]
+        self.url = '/api/v1/places/{}/reviews'.format(self.place.id)
+
+    def tearDown(self):
+        """Remove the place, the user and their reviews"""
+        models.storage.close()
+        place_id = self.keys[-1][1]
+        for review in models.storage.find(Review, "place_id", place_id):
+            models.storage.delete(review)
+        for cls, id in reversed(self.keys):
+            models.storage.delete(models.storage.get(cls, id))
+        models.storage.save()
+
+    def test_post_list(self):
+        """Test that every review of a list belongs to the place of the
+        URL"""
+        body = [{"text": "One", "user_id": self.user.id},
+                {"text": "Two", "user_id": self.user.id}]
+        resp = self.client.post(self.url, json=body)
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual([obj["text"] for obj in resp.json], ["One", "Two"])
+        for obj in resp.json:
+            self.assertEqual(obj["place_id"], self.place.id)
+        found = models.storage.find(Review, "place_id", self.place.id)
+        self.assertEqual(len(found), 2)
+
+    def test_post_user_id_not_string(self):
+        """Test that a user_id that is not a string is not found, in a list
+        or a single object, and creates no review"""
+        for user_id in (5, None, [self.user.id], {"id": self.user.id}):
+            with self.subTest(user_id=user_id):
+                body = {"text": "One", "user_id": user_id}
+                resp = self.client.post(self.url, json=body)
+                self.assertEqual(resp.status_code, 404)
+                good = {"text": "Two", "user_id": self.user.id}
+                resp = self.client.post(self.url, json=[good, body])
+                self.assertEqual(resp.status_code, 404)
+                self.assertEqual(resp.json, {"error": "Not found"})
+        self.assertEqual(
+            models.storage.find(Review, "place_id", self.place.id), [])
@@ -0,0 +1,86 @@
+#!/usr/bin/python3
+"""
+Contains the TestStatesDocs and TestStatesPost classes
+"""
+
+from api.v1.app import my_App
+from api.v1.views import states
+import models
+from models.state import State
+import pep8
+import unittest
+
+
+class TestStatesDocs(unittest.TestCase):
+    """Tests to check the style of the State views"""
+
+    def test_pep8_conformance_states(self):
+        """Test that api/v1/views/states.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/states.py',
+                                    'tests/test_api/test_v1/test_views/\
+test_states.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_states_module_docstring(self):
+        """Test for the states.py module docstring"""
+        self.assertTrue(states.__doc__ and len(states.__doc__) >= 1,
+                        "states.py needs a docstring")
+
+
+class TestStatesPost(unittest.TestCase):
+    """Test that POST /states creates one state or a list of them"""
+
+    def setUp(self):
+        """Set up a test client and count the states"""
+        self.client = my_App.test_client()
+        self.before = models.storage.count(State)
+
+    def tearDown(self):
+        """Remove the states created by the test"""
+        models.storage.close()
+        for state in list(models.storage.all(State).values()):
+            if state.name.startswith("Posted"):
+                models.storage.delete(state)
+        models.storage.save()
+
+    def test_post_one(self):
+        """Test that a single object creates a state and returns it"""
+        resp = self.client.post('/api/v1/states', json={"name": "Posted"})
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(resp.json["name"], "Posted")
+        self.assertEqual(resp.json["__class__"], "State")
+        self.assertIsNotNone(models.storage.get(State, resp.json["id"]))
+
+    def test_post_list(self):
+        """Test that a list creates every state and returns their list, in
+        the order of the body"""
+        body = [{"name": "Posted {}".format(i)} for i in range(3)]
+        resp = self.client.post('/api/v1/states', json=body)
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual([obj["name"] for obj in resp.json],
+                         ["Posted 0", "Posted 1", "Posted 2"])
+        for obj in resp.json:
+            self.assertEqual(models.storage.get(State, obj["id"]).name,
+                             obj["name"])
+        self.assertEqual(models.storage.count(State), self.before + 3)
+
+    def test_post_list_all_or_nothing(self):
+        """Test that a list with an invalid object creates no state"""
+        body = [{"name": "Posted"}, {"nom": "Posted"}]
+        resp = self.client.post('/api/v1/states', json=body)
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn(b"Missing name", resp.data)
+        self.assertEqual(models.storage.count(State), self.before)
+
+    def test_post_list_not_objects(self):
+        """Test that a list that is empty or holds anything but non-empty
+        objects is not a JSON body"""
+        for body in ([], [{"name": "Posted"}, 5], [{"name": "Posted"}, {}],
+                     [["Posted"]]):
+            with self.subTest(body=body):
+                resp = self.client.post('/api/v1/states', json=body)
+                self.assertEqual(resp.status_code, 400)
+                self.assertIn(b"Not a JSON", resp.data)
+        self.assertEqual(models.storage.count(State), self.before)
@@ -2,6 +2,7 @@
 """Test BaseModel for expected behavior and documentation"""
 from datetime import datetime
 import inspect
+import json
 import models
 import pep8 as pycodestyle
 import time
@@ -96,6 +97,36 @@ class TestBaseModel(unittest.TestCase):
         self.assertNotEqual(inst1.created_at, inst2.created_at)
         self.assertNotEqual(inst1.updated_at, inst2.updated_at)
 
+    def test_datetime_from_kwargs(self):
+        """Test the timestamps read from kwargs, as strings or datetimes"""
+        d = BaseModel().to_dict()
+        inst = BaseModel(**d)
+        self.assertIs(inst.created_at, inst.updated_at)
+        d["updated_at"] = "2017-09-28T21:03:54.052302"
+        inst = BaseModel(**d)
+        self.assertEqual(inst.updated_at,
+                         datetime(2017, 9, 28, 21, 3, 54, 52302))
+        self.assertNotEqual(inst.created_at, inst.updated_at)
+        created_at = datetime(2017, 9, 28, 21, 3, 54)
+        inst = BaseModel(created_at=created_at, updated_at=created_at)
+        self.assertIs(inst.created_at, created_at)
+        self.assertIs(inst.updated_at, created_at)
+        self.assertEqual(inst.to_dict()["created_at"],
+                         "2017-09-28T21:03:54.000000")
+
+    def test_datetime_from_kwargs_format(self):
+        """Test that the timestamps read from kwargs are the strings strptime
+        accepts with the format of to_dict()"""
+        inst = BaseModel(created_at="2017-9-28T21:3:54.5")
+        self.assertEqual(inst.created_at, datetime(2017, 9, 28, 21, 3, 54,
+                                                   500000))
+        for value in ("2017-09-28", "2017-09-28T21:03:54",
+                      "2017-09-28 21:03:54.052302",
+                      "2017-09-28T21:03:54.052302+00:00"):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    BaseModel(created_at=value)
+
     def test_uuid(self):
         """Test that id is a valid uuid"""
         inst1 = BaseModel()
@@ -138,6 +169,37 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(new_d["created_at"], bm.created_at.strftime(t_format))
         self.assertEqual(new_d["updated_at"], bm.updated_at.strftime(t_format))
 
+    def test_to_json(self):
+        """Test that to_json writes to_dict() like jsonify does"""
+        inst = BaseModel()
+        inst.name = "Café"
+        self.assertEqual(inst.to_json(),
+                         json.dumps(inst.to_dict(), sort_keys=True,
+                                    separators=(",", ":")).encode())
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_to_dict_cache(self):
+        """Test that to_dict and to_json are kept until an attribute is set
+        or one of the lists changes"""
+        inst = BaseModel()
+        inst.name = "Holberton"
+        inst.ids = ["a"]
+        d = inst.to_dict()
+        d["name"] = "Changed by the caller"
+        self.assertEqual(inst.to_dict()["name"], "Holberton")
+        data = inst.to_json()
+        self.assertIs(inst.to_json(), data)
+        inst.name = "Betty"
+        self.assertEqual(inst.to_dict()["name"], "Betty")
+        self.assertIn(b'"Betty"', inst.to_json())
+        inst.ids.append("b")
+        self.assertEqual(inst.to_dict()["ids"], ["a", "b"])
+        self.assertIn(b'["a","b"]', inst.to_json())
+        del inst.name
+        self.assertNotIn("name", inst.to_dict())
+        inst.nested = {"a": 1}
+        self.assertIsNot(inst.to_json(), inst.to_json())
+
     def test_str(self):
         """test that the str method has the correct output"""
         inst = BaseModel()
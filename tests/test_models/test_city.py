@@ -85,6 +85,21 @@ class TestCity(unittest.TestCase):
         else:
             self.assertEqual(city.state_id, "")
 
+    @unittest.skipIf(models.storage_t == 'db', "not testing File Storage")
+    def test_places(self):
+        """Test that places lists the places whose city_id is the city's"""
+        from models.place import Place
+        city = City()
+        other = City()
+        place = Place(city_id=city.id)
+        models.storage.new(place)
+        self.assertEqual(city.places, [place])
+        place.city_id = other.id
+        self.assertEqual(city.places, [])
+        self.assertEqual(other.places, [place])
+        models.storage.delete(place)
+        self.assertEqual(other.places, [])
+
     def test_to_dict_creates_dict(self):
         """test to_dict method creates a dictionary with proper attrs"""
         c = City()
@@ -0,0 +1,105 @@
+#!/usr/bin/python3
+"""
+Contains the TestAsyncDBStorageDocs and TestAsyncDBStorage classes
+"""
+
+import asyncio
+import inspect
+import models
+from models.city import City
+from models.state import State
+import pep8
+import unittest
+try:
+    from models.engine import async_db_storage
+    from models.engine.async_db_storage import AsyncDBStorage
+except ImportError:
+    async_db_storage = None
+
+
+class TestAsyncDBStorageDocs(unittest.TestCase):
+    """Tests to check the documentation and style of AsyncDBStorage"""
+
+    def test_pep8_conformance_async_db_storage(self):
+        """Test that models/engine/async_db_storage.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/async_db_storage.py',
+                                    'api/v1/views/async_views.py',
+                                    'tests/test_models/test_engine/\
+test_async_db_storage.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    @unittest.skipIf(async_db_storage is None, "sqlalchemy[asyncio] missing")
+    def test_async_db_storage_docstrings(self):
+        """Test for the docstrings of the module, class and methods"""
+        self.assertTrue(len(async_db_storage.__doc__) >= 1,
+                        "async_db_storage.py needs a docstring")
+        self.assertTrue(len(AsyncDBStorage.__doc__) >= 1,
+                        "AsyncDBStorage class needs a docstring")
+        for name, func in inspect.getmembers(AsyncDBStorage,
+                                             inspect.isfunction):
+            self.assertTrue(func.__doc__ and len(func.__doc__) >= 1,
+                            "{:s} method needs a docstring".format(name))
+
+
+@unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+@unittest.skipIf(async_db_storage is None, "sqlalchemy[asyncio] missing")
+class TestAsyncDBStorage(unittest.TestCase):
+    """Test the AsyncDBStorage class against the database of DBStorage"""
+
+    def setUp(self):
+        """Create a state with two cities through the sync storage"""
+        self.state = State(name="Async")
+        self.cities = [City(name="One", state_id=self.state.id),
+                       City(name="Two", state_id=self.state.id)]
+        models.storage.bulk_new([self.state] + self.cities)
+        self.storage = AsyncDBStorage()
+
+    def tearDown(self):
+        """Remove the objects created by setUp"""
+        for obj in self.cities + [self.state]:
+            models.storage.delete(obj)
+        models.storage.save()
+
+    def run_closed(self, coroutine):
+        """runs coroutine in a new event loop, then closes the session"""
+        async def run():
+            try:
+                return await coroutine
+            finally:
+                await self.storage.close()
+        return asyncio.run(run())
+
+    def test_get(self):
+        """Test that get returns the object loaded with load"""
+        state = self.run_closed(self.storage.get(State, self.state.id,
+                                                 load=["cities"]))
+        self.assertEqual(state.id, self.state.id)
+        self.assertEqual(set(city.id for city in state.cities),
+                         set(city.id for city in self.cities))
+        self.assertIsNone(self.run_closed(self.storage.get(State, "nope")))
+
+    def test_all(self):
+        """Test that all returns the objects of the class, paged by id"""
+        states = self.run_closed(self.storage.all(State))
+        self.assertIn("State." + self.state.id, states)
+        ids = sorted(city.id for city in self.cities)
+        cities = self.run_closed(self.storage.find(City, "state_id",
+                                                   self.state.id, limit=1))
+        self.assertEqual([city.id for city in cities], ids[:1])
+
+    def test_counts(self):
+        """Test that counts agrees with the sync storage"""
+        self.assertEqual(self.run_closed(self.storage.counts([State, City])),
+                         models.storage.counts([State, City]))
+        self.assertEqual(self.run_closed(self.storage.count(State)),
+                         models.storage.count(State))
+
+    def test_iter(self):
+        """Test that iter yields every object of the class"""
+        async def ids():
+            return [obj.id async for obj in self.storage.iter(City, 1)]
+        ids = self.run_closed(ids())
+        for city in self.cities:
+            self.assertIn(city.id, ids)
@@ -8,16 +8,22 @@ import inspect
 import models
 from models.engine import db_storage
 from models.amenity import Amenity
-from models.base_model import BaseModel
+from models.base_model import BaseModel, Base
 from models.city import City
+from models.engine.sqlite_storage import SQLiteStorage
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
+import gc
 import json
 import os
 import pep8
+import sqlalchemy
+import sqlite3
+import tempfile
 import unittest
+from unittest import mock
 from models import storage
 DBStorage = db_storage.DBStorage
 classes = {"Amenity": Amenity, "City": City, "Place": Place,
@@ -97,6 +103,30 @@ class TestFileStorage(unittest.TestCase):
         get_instance = storage.get(State, instance.id)
         self.assertEqual(get_instance, instance)
 
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_get_by_primary_key(self):
+        """Test that get looks an object up by its primary key, without a
+        query when the session already holds it"""
+        engine = models.storage._DBStorage__engine
+        statements = []
+
+        def count(conn, cursor, statement, *args):
+            """records the statements sent to the database"""
+            statements.append(statement)
+        state = State(name="Oaxaca")
+        storage.new(state)
+        storage.save()
+        sqlalchemy.event.listen(engine, "before_cursor_execute", count)
+        try:
+            self.assertIs(storage.get(State, state.id), state)
+            self.assertEqual(statements, [])
+            self.assertIsNone(storage.get(State, "missing"))
+            self.assertEqual(len(statements), 1)
+            self.assertIn("WHERE", statements[0])
+        finally:
+            sqlalchemy.event.remove(engine, "before_cursor_execute", count)
+        self.assertIsNone(storage.get(str, state.id))
+
     def test_to_count(self):
         """ Tests count method db storage """
         dicty = {"name": "Vecindad"}
@@ -108,3 +138,331 @@ class TestFileStorage(unittest.TestCase):
         storage.save()
         c = storage.count()
         self.assertEqual(len(storage.all()), c)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_counts_single_query(self):
+        """Test that counts counts every class in a single query"""
+        engine = models.storage._DBStorage__engine
+        statements = []
+
+        def count(conn, cursor, statement, *args):
+            """records the statements sent to the database"""
+            statements.append(statement)
+        state = State(name="Jalisco")
+        storage.new(state)
+        storage.save()
+        sqlalchemy.event.listen(engine, "before_cursor_execute", count)
+        try:
+            counts = storage.counts([State, "City"])
+        finally:
+            sqlalchemy.event.remove(engine, "before_cursor_execute", count)
+        self.assertEqual(len(statements), 1)
+        self.assertIn("count(", statements[0].lower())
+        self.assertEqual(counts, {"State": len(storage.all(State)),
+                                  "City": len(storage.all(City))})
+        self.assertEqual(storage.count(State), counts["State"])
+        self.assertEqual(storage.count("State"), counts["State"])
+        self.assertEqual(storage.counts(["Foo", State])["Foo"], 0)
+        self.assertEqual(storage.counts(["Foo"]), {"Foo": 0})
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_load_relationships(self):
+        """Test that get and all load the relationship paths in load with
+        one query per relationship, whatever the number of objects"""
+        engine = models.storage._DBStorage__engine
+        statements = []
+
+        def count(conn, cursor, statement, *args):
+            """records the statements sent to the database"""
+            statements.append(statement)
+        user = User(email="a@b.c", password="pwd")
+        state = State(name="Chiapas")
+        storage.new(user)
+        storage.new(state)
+        for i in range(3):
+            city = City(name="City {}".format(i), state_id=state.id)
+            storage.new(city)
+            for j in range(2):
+                storage.new(Place(name="Place", city_id=city.id,
+                                  user_id=user.id))
+        storage.save()
+        storage.close()
+        sqlalchemy.event.listen(engine, "before_cursor_execute", count)
+        try:
+            state = storage.get(State, state.id, load=["cities.places"])
+            places = [place for city in state.cities for place in city.places]
+            self.assertEqual(len(places), 6)
+            self.assertEqual(len(statements), 3)
+            del statements[:]
+            states = storage.all(State, load=["cities"])
+            self.assertEqual(len(states["State." + state.id].cities), 3)
+            self.assertEqual(len(statements), 2)
+            storage.close()
+            state = storage.get(State, state.id)
+            del statements[:]
+            state = storage.get(State, state.id, load=["cities"])
+            self.assertEqual(len(statements), 2)
+            self.assertNotIn("cities", sqlalchemy.inspect(state).unloaded)
+        finally:
+            sqlalchemy.event.remove(engine, "before_cursor_execute", count)
+            storage.close()
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_pages(self):
+        """Test that all and find page through the objects in the order of
+        their ids, with a keyset query"""
+        engine = models.storage._DBStorage__engine
+        statements = []
+
+        def count(conn, cursor, statement, *args):
+            """records the statements sent to the database"""
+            statements.append(statement)
+        state = State(name="Durango")
+        storage.new(state)
+        for i in range(3):
+            storage.new(City(name="City {}".format(i), state_id=state.id))
+        storage.save()
+        ids = sorted(s.id for s in storage.all(State).values())
+        sqlalchemy.event.listen(engine, "before_cursor_execute", count)
+        try:
+            page = storage.all(State, limit=1, after=ids[0])
+        finally:
+            sqlalchemy.event.remove(engine, "before_cursor_execute", count)
+        self.assertEqual([s.id for s in page.values()], ids[1:2])
+        self.assertIn("ORDER BY", statements[0])
+        self.assertIn("LIMIT", statements[0])
+        ids = sorted(c.id for c in state.cities)
+        page = storage.find(City, "state_id", state.id, limit=2)
+        self.assertEqual([c.id for c in page], ids[:2])
+        page = storage.find(City, "state_id", state.id, after=ids[1])
+        self.assertEqual([c.id for c in page], ids[2:])
+        page = storage.all(limit=2)
+        self.assertEqual(list(page), sorted(page, key=lambda k: page[k].id))
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_iter(self):
+        """Test that iter yields the objects all returns, batch by batch"""
+        storage.bulk_new([State(name="Iter {}".format(i)) for i in range(5)])
+        ids = sorted(state.id for state in storage.iter(State, batch_size=2))
+        states = storage.all(State).values()
+        self.assertEqual(ids, sorted(state.id for state in states))
+        self.assertEqual(len(list(storage.iter())), storage.count())
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_bulk_new(self):
+        """Test that bulk_new inserts the objects of a class in one batch"""
+        engine = models.storage._DBStorage__engine
+        statements = []
+
+        def count(conn, cursor, statement, *args):
+            """records the statements sent to the database"""
+            statements.append(statement)
+        states = [State(name="Bulk {}".format(i)) for i in range(50)]
+        sqlalchemy.event.listen(engine, "before_cursor_execute", count)
+        try:
+            storage.bulk_new(states)
+        finally:
+            sqlalchemy.event.remove(engine, "before_cursor_execute", count)
+        inserts = [s for s in statements if s.startswith("INSERT")]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(storage.get(State, states[-1].id), states[-1])
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_batch_rollback(self):
+        """Test that a batch that raises commits none of its changes"""
+        kept = State(name="Kept")
+        kept.save()
+        added = State(name="Added")
+        ids = (kept.id, added.id)
+        with self.assertRaises(ValueError):
+            with storage.batch():
+                added.save()
+                kept.name = "Renamed"
+                kept.save()
+                raise ValueError
+        storage.close()
+        self.assertEqual(storage.get(State, ids[0]).name, "Kept")
+        self.assertIsNone(storage.get(State, ids[1]))
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_read_replicas(self):
+        """Test that a session reads from a replica until it writes, then
+        reads its own writes from the primary"""
+        with tempfile.TemporaryDirectory() as tmp:
+            env = {"HBNB_ENV": "",
+                   "HBNB_SQLITE_PATH": os.path.join(tmp, "primary.db"),
+                   "HBNB_SQLITE_REPLICA_PATHS": os.path.join(tmp, "r.db")}
+            with mock.patch.dict(os.environ, env):
+                dbs = SQLiteStorage()
+            engines = [dbs._DBStorage__engine] + dbs._DBStorage__replicas
+            self.assertEqual(len(engines), 2)
+            dbs.reload()
+            Base.metadata.create_all(engines[1])
+            try:
+                state = State(name="Sonora")
+                dbs.new(state)
+                dbs.save()
+                self.assertEqual(dbs.count(State), 1)
+                dbs.close()
+                # the stand-in replica never catches up with the primary
+                self.assertEqual(dbs.count(State), 0)
+                self.assertIsNone(dbs.get(State, state.id))
+                dbs.new(State(name="Sinaloa"))
+                self.assertEqual(dbs.count(State), 2)
+                self.assertEqual(dbs.get(State, state.id).name, "Sonora")
+                dbs.close()
+            finally:
+                for engine in engines:
+                    engine.dispose()
+
+
+class TestPool(unittest.TestCase):
+    """Test the connection pool settings and metrics of DBStorage"""
+
+    def test_pool_options(self):
+        """Test that the pool settings come from the environment"""
+        env = {"HBNB_DB_POOL_SIZE": "3", "HBNB_DB_MAX_OVERFLOW": "7",
+               "HBNB_DB_POOL_TIMEOUT": "0.5", "HBNB_DB_POOL_PRE_PING": "1"}
+        with mock.patch.dict(os.environ, env):
+            options = db_storage.pool_options()
+        self.assertIs(options["poolclass"], db_storage.MeteredPool)
+        self.assertEqual(options["pool_size"], 3)
+        self.assertEqual(options["max_overflow"], 7)
+        self.assertEqual(options["pool_timeout"], 0.5)
+        self.assertTrue(options["pool_pre_ping"])
+        self.assertNotIn("pool_recycle", options)
+
+    def test_metered_pool(self):
+        """Test that the pool counts checkouts and timeouts"""
+        pool = db_storage.MeteredPool(lambda: sqlite3.connect(":memory:"),
+                                      pool_size=1, max_overflow=0,
+                                      timeout=0.01)
+        conn = pool.connect()
+        with self.assertRaises(sqlalchemy.exc.TimeoutError):
+            pool.connect()
+        conn.close()
+        pool.connect().close()
+        self.assertEqual(pool.metrics["checkouts"], 2)
+        self.assertEqual(pool.metrics["timeouts"], 1)
+        self.assertGreaterEqual(pool.metrics["wait_total"],
+                                pool.metrics["wait_max"])
+
+    def test_after_fork(self):
+        """Test that a forked worker resets the pools of the DBStorage
+        objects alive, which are not kept alive for it"""
+        with tempfile.TemporaryDirectory() as tmp:
+            env = {"HBNB_ENV": "",
+                   "HBNB_SQLITE_PATH": os.path.join(tmp, "fork.db")}
+            with mock.patch.dict(os.environ, env):
+                dbs = SQLiteStorage()
+            self.assertIn(dbs, db_storage.instances)
+            with mock.patch.object(SQLiteStorage, "_after_fork") as reset:
+                db_storage.after_fork()
+            self.assertIn(mock.call(), reset.call_args_list)
+            alive = len(db_storage.instances)
+            dbs._DBStorage__engine.dispose()
+            del dbs
+            gc.collect()
+            self.assertEqual(len(db_storage.instances), alive - 1)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_pool_stats(self):
+        """Test that pool_stats reports the pool and its metrics"""
+        storage.count()
+        stats = storage.pool_stats()
+        for key in ("size", "checked_in", "checked_out", "overflow",
+                    "checkouts", "timeouts", "wait_total", "wait_max"):
+            self.assertIn(key, stats)
+        self.assertGreater(stats["checkouts"], 0)
+
+
+@unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+class TestIndexes(unittest.TestCase):
+    """Test that the hot queries of DBStorage use an index"""
+
+    def plans(self, run):
+        """Return the query plans of the queries run sends to the database,
+        as the text of each line for SQLite, the key and extra columns for
+        MySQL"""
+        engine = models.storage._DBStorage__engine
+        queries = []
+
+        def record(conn, cursor, statement, parameters, *args):
+            """records the queries sent to the database"""
+            if statement.startswith("SELECT"):
+                queries.append((statement, parameters))
+        sqlalchemy.event.listen(engine, "before_cursor_execute", record)
+        try:
+            run()
+        finally:
+            sqlalchemy.event.remove(engine, "before_cursor_execute", record)
+        self.assertTrue(queries)
+        plans = []
+        with engine.connect() as conn:
+            for statement, parameters in queries:
+                if engine.dialect.name == "sqlite":
+                    rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " +
+                                                statement, parameters)
+                    plans.append(" ".join(row[-1] for row in rows))
+                else:
+                    rows = conn.exec_driver_sql("EXPLAIN " + statement,
+                                                parameters).mappings()
+                    plans.append(" ".join("{} {}".format(row["key"],
+                                                         row["Extra"])
+                                          for row in rows))
+        return plans
+
+    def assertUsesIndex(self, run, index):
+        """Assert that every query run sends uses index, without sorting"""
+        for plan in self.plans(run):
+            self.assertIn(index, plan)
+            self.assertNotIn("SCAN", plan)
+            self.assertNotIn("TEMP B-TREE", plan)
+            self.assertNotIn("filesort", plan)
+
+    def test_primary_key(self):
+        """Test that get and the pages of all walk the primary key"""
+        if models.storage._DBStorage__engine.dialect.name == "sqlite":
+            index = "sqlite_autoindex_states_1"
+        else:
+            index = "PRIMARY"
+        storage.close()
+        self.assertUsesIndex(lambda: storage.get(State, "missing"), index)
+        self.assertUsesIndex(lambda: storage.all(State, limit=10, after=""),
+                             index)
+
+    def test_foreign_keys(self):
+        """Test that the objects of a parent, paged or not, are looked up
+        in the composite index of its foreign key"""
+        for cls, attr, index in ((City, "state_id", "ix_cities_state_id"),
+                                 (Place, "city_id", "ix_places_city_id"),
+                                 (Place, "user_id", "ix_places_user_id"),
+                                 (Review, "place_id", "ix_reviews_place_id"),
+                                 (Review, "user_id", "ix_reviews_user_id")):
+            with self.subTest(cls=cls.__name__, attr=attr):
+                self.assertUsesIndex(lambda: storage.find(cls, attr, "id"),
+                                     index)
+                self.assertUsesIndex(lambda: storage.find(
+                    cls, attr, "id", limit=10, after=""), index)
+
+    def test_relationships(self):
+        """Test that the relationships are loaded through the indexes"""
+        state = State(name="Nayarit")
+        amenity = Amenity(name="Wifi")
+        storage.new(state)
+        storage.new(amenity)
+        storage.save()
+        self.assertUsesIndex(lambda: state.cities, "ix_cities_state_id")
+        self.assertUsesIndex(lambda: amenity.place_amenities,
+                             "ix_place_amenity_amenity_id")
+
+    def test_attributes(self):
+        """Test that users are looked up by email and places by price or
+        location through an index"""
+        self.assertUsesIndex(lambda: storage.find(User, "email", "a@b.c"),
+                             "ix_users_email")
+        self.assertUsesIndex(lambda: storage.find(Place, "price_by_night",
+                                                  100),
+                             "ix_places_price_by_night")
+        self.assertUsesIndex(lambda: storage.find(Place, "latitude", 37.7),
+                             "ix_places_location")
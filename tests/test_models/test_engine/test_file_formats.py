@@ -0,0 +1,85 @@
+#!/usr/bin/python3
+"""
+Contains the TestFileFormatsDocs and TestFileFormats classes
+"""
+
+import inspect
+from models.engine import file_formats
+from models.state import State
+from models.user import User
+import os
+import pep8
+import unittest
+
+
+class TestFileFormatsDocs(unittest.TestCase):
+    """Tests to check the documentation and style of file_formats"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.ff_f = inspect.getmembers(file_formats, inspect.isfunction)
+
+    def test_pep8_conformance_file_formats(self):
+        """Test that models/engine/file_formats.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/file_formats.py',
+                                    'tests/test_models/test_engine/\
+test_file_formats.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_file_formats_module_docstring(self):
+        """Test for the file_formats.py module docstring"""
+        self.assertIsNot(file_formats.__doc__, None,
+                         "file_formats.py needs a docstring")
+        self.assertTrue(len(file_formats.__doc__) >= 1,
+                        "file_formats.py needs a docstring")
+
+    def test_ff_func_docstrings(self):
+        """Test for the presence of docstrings in file_formats functions"""
+        for func in self.ff_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} function needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} function needs a docstring".format(func[0]))
+
+
+class TestFileFormats(unittest.TestCase):
+    """Test the formats FileStorage can write"""
+    path = "file_formats_test.tmp"
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up records to write"""
+        state = State(name="California")
+        user = User(email="a@b.c", password="pwd", first_name=None)
+        user.nested = {"list": [1, 2.5, "three"], "bool": True}
+        cls.records = {}
+        for obj in (state, user):
+            key = obj.__class__.__name__ + "." + obj.id
+            cls.records[key] = obj.to_dict(save_fs=1)
+
+    def tearDown(self):
+        """Remove the written file"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def test_round_trip(self):
+        """Test that every format loads back the records it dumped"""
+        for fmt in file_formats.formats:
+            with self.subTest(fmt=fmt):
+                file_formats.dump(self.records, self.path, fmt)
+                self.assertEqual(file_formats.load(self.path), self.records)
+
+    def test_convert(self):
+        """Test that convert rewrites a file in another format"""
+        file_formats.dump(self.records, self.path, "json")
+        file_formats.convert(self.path, self.path, "marshal.gz")
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(2), b"\x1f\x8b")
+        self.assertEqual(file_formats.load(self.path), self.records)
+
+    def test_unknown_format(self):
+        """Test that dump refuses a format it does not know"""
+        with self.assertRaises(ValueError):
+            file_formats.dump(self.records, self.path, "xml")
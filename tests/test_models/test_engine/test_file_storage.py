@@ -15,9 +15,13 @@ from models.review import Review
 from models.state import State
 from models.user import User
 import json
+import multiprocessing
 import os
 import pep8
+import shutil
+import threading
 import unittest
+from unittest import mock
 FileStorage = file_storage.FileStorage
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
@@ -125,6 +129,8 @@ class TestFileStorage(unittest.TestCase):
         storage = FileStorage()
         get_instance = storage.get(State, instance.id)
         self.assertEqual(get_instance, instance)
+        for id in (5, None, [instance.id], {"id": instance.id}):
+            self.assertIsNone(storage.get(State, id))
 
     @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
     def test_for_count(self):
@@ -139,3 +145,758 @@ class TestFileStorage(unittest.TestCase):
         storage.save()
         c = storage.count()
         self.assertEqual(len(storage.all()), c)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_counts(self):
+        """Test that counts counts each class like count does"""
+        storage = FileStorage()
+        storage.new(State(name="Vecindad"))
+        counts = storage.counts([State, "City"])
+        self.assertEqual(counts, {"State": storage.count(State),
+                                  "City": storage.count(City)})
+        self.assertEqual(sum(storage.counts().values()), storage.count())
+        self.assertEqual(storage.counts(["Foo", State])["Foo"], 0)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_all_pages(self):
+        """Test that all pages through the objects in the order of their
+        ids, keeping its ordered index up to date"""
+        storage = FileStorage()
+        states = [State(name="Page {}".format(i)) for i in range(5)]
+        for state in states[:3]:
+            storage.new(state)
+        ids = sorted(s.id for s in storage.all(State).values())
+        self.assertEqual([s.id for s in storage.all(State, limit=2).values()],
+                         ids[:2])
+        for state in states[3:]:
+            storage.new(state)
+        storage.delete(states[0])
+        ids = sorted(s.id for s in storage.all(State).values())
+        pages, after = [], None
+        while True:
+            page = storage.all(State, limit=2, after=after)
+            if not page:
+                break
+            pages += [s.id for s in page.values()]
+            after = pages[-1]
+        self.assertEqual(pages, ids)
+        page = storage.all(limit=3)
+        self.assertEqual(len(page), 3)
+        self.assertEqual(list(page), sorted(page, key=lambda k: page[k].id))
+        for state in states[1:]:
+            storage.delete(state)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_iter(self):
+        """Test that iter yields the objects all returns, in the order of
+        their ids, batch by batch"""
+        storage = FileStorage()
+        states = [State(name="Iterated") for i in range(5)]
+        for state in states:
+            storage.new(state)
+        self.assertEqual(list(storage.iter(State, batch_size=2)),
+                         sorted(storage.all(State).values(),
+                                key=lambda obj: obj.id))
+        self.assertIn(states[0], storage.iter("State"))
+        self.assertEqual(len(list(storage.iter())), storage.count())
+        walk = storage.iter(State, batch_size=2)
+        first = next(walk)
+        for state in states:
+            if state.id > first.id:
+                storage.delete(state)
+        added = State(id="~", name="Iterated")
+        storage.new(added)
+        rest = list(walk)
+        self.assertEqual([obj for obj in rest if obj in states], [])
+        self.assertIs(rest[-1], added)
+        for state in states + [added]:
+            storage.delete(state)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_find_pages(self):
+        """Test that find pages through the objects in the order of their
+        ids, keeping an ordered index of the values paged through up to
+        date"""
+        storage = FileStorage()
+        state = State(name="Paged")
+        cities = [City(name="City", state_id=state.id) for i in range(3)]
+        for city in cities:
+            storage.new(city)
+        ids = sorted(city.id for city in cities)
+        page = storage.find(City, "state_id", state.id, limit=2)
+        self.assertEqual([city.id for city in page], ids[:2])
+        page = storage.find(City, "state_id", state.id, after=ids[0])
+        self.assertEqual([city.id for city in page], ids[1:])
+        page = storage.find(City, "name", "City", limit=1, after=ids[1])
+        self.assertEqual([city.id for city in page], ids[2:])
+        order = FileStorage._FileStorage__order
+        self.assertEqual(order[("City", "state_id", state.id)], ids)
+        moved = storage.get(City, ids[0])
+        moved.state_id = "elsewhere"
+        cities.append(City(name="City", state_id=state.id))
+        storage.new(cities[-1])
+        ids = sorted(ids[1:] + [cities[-1].id])
+        page = storage.find(City, "state_id", state.id, limit=10)
+        self.assertEqual([city.id for city in page], ids)
+        for city in cities:
+            storage.delete(city)
+        self.assertEqual(storage.find(City, "state_id", state.id, limit=1),
+                         [])
+        self.assertEqual(order[("City", "state_id", state.id)], [])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_new_after_paging(self):
+        """Test that objects added or deleted after a page was read are
+        filed aside, and merged into the ordered index at the next read"""
+        storage = FileStorage()
+        states = [State(name="Paged") for i in range(3)]
+        for state in states[:2]:
+            storage.new(state)
+        storage.all(State, limit=1)
+        order = FileStorage._FileStorage__order["State"]
+        before = list(order)
+        storage.new(states[2])
+        storage.delete(states[0])
+        storage.new(states[0])
+        storage.delete(states[1])
+        self.assertEqual(order, before)
+        ids = sorted(obj.id for obj in storage.all(State).values())
+        page = storage.all(State, limit=len(ids))
+        self.assertEqual([obj.id for obj in page.values()], ids)
+        self.assertIn(states[0].id, ids)
+        self.assertIn(states[2].id, ids)
+        self.assertNotIn(states[1].id, ids)
+        for state in states:
+            storage.delete(state)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_all_cls_uses_class_buckets(self):
+        """Test that all(cls) and count(cls) only see objects of cls"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        state = State(name="California")
+        city = City(name="San Francisco", state_id=state.id)
+        storage.new(state)
+        storage.new(city)
+        self.assertEqual(storage.all(State), {"State." + state.id: state})
+        self.assertEqual(storage.all("City"), {"City." + city.id: city})
+        self.assertEqual(storage.count(State), 1)
+        self.assertEqual(storage.count(Place), 0)
+        storage.delete(state)
+        self.assertEqual(storage.all(State), {})
+        self.assertEqual(storage.count(State), 0)
+        self.assertEqual(storage.count(), 1)
+        FileStorage._FileStorage__objects = save
+        self.assertEqual(storage.count(), len(save))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_foreign_key_indexes(self):
+        """Test that the relationship properties follow the foreign keys,
+        even when they are reassigned"""
+        storage = models.storage
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        ca = State(name="California")
+        nv = State(name="Nevada")
+        city = City(name="San Francisco", state_id=ca.id)
+        place = Place(name="Loft", city_id=city.id)
+        review = Review(text="Nice", place_id=place.id)
+        wifi = Amenity(name="Wifi")
+        for obj in (ca, nv, city, place, review, wifi):
+            storage.new(obj)
+        self.assertEqual(ca.cities, [city])
+        self.assertEqual(nv.cities, [])
+        city.state_id = nv.id
+        self.assertEqual(ca.cities, [])
+        self.assertEqual(nv.cities, [city])
+        self.assertEqual(storage.find(Place, "city_id", city.id), [place])
+        self.assertEqual(place.reviews, [review])
+        storage.delete(review)
+        self.assertEqual(place.reviews, [])
+        place.amenity_ids.append(wifi.id)
+        self.assertEqual(place.amenities, [wifi])
+        self.assertEqual(Place().amenities, [])
+        FileStorage._FileStorage__objects = save
+        self.assertNotIn(city, nv.cities)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_shares_strings(self):
+        """Test that reloaded objects share their key and foreign key values,
+        and that only the fingerprints of their records are kept"""
+        storage = FileStorage()
+        state = State(name="Shared")
+        cities = [City(name="One", state_id=state.id),
+                  City(name="Two", state_id=state.id)]
+        for city in cities:
+            storage.new(city)
+        storage.save()
+        keys = ["City." + city.id for city in cities]
+        for key in keys:
+            del FileStorage._FileStorage__objects[key]
+            del FileStorage._FileStorage__records[key]
+        FileStorage._FileStorage__stamp = None
+        storage.reload()
+        one, two = [storage.get(City, city.id) for city in cities]
+        objects = FileStorage._FileStorage__objects
+        records = FileStorage._FileStorage__records
+        self.assertIs(one.state_id, two.state_id)
+        for key in keys:
+            self.assertIs(next(k for k in objects if k == key),
+                          next(k for k in records if k == key))
+            self.assertEqual(type(records[key]), int)
+        for city in (one, two):
+            storage.delete(city)
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_writes_dirty_objects(self):
+        """Test that save only looks at the objects set, added or deleted
+        since the last save, and writes nothing if there are none"""
+        storage = FileStorage()
+        state = State(name="Dirty")
+        storage.new(state)
+        storage.save()
+        stat = os.stat("file.json")
+        storage.save()
+        self.assertEqual(os.stat("file.json").st_mtime_ns, stat.st_mtime_ns)
+        vars(state)["name"] = "Not tracked"
+        storage.save()
+        with open("file.json", "r") as f:
+            self.assertEqual(json.load(f)["State." + state.id]["name"],
+                             "Dirty")
+        state.name = "Tracked"
+        storage.save()
+        with open("file.json", "r") as f:
+            self.assertEqual(json.load(f)["State." + state.id]["name"],
+                             "Tracked")
+        storage.delete(state)
+        storage.save()
+        with open("file.json", "r") as f:
+            self.assertNotIn("State." + state.id, json.load(f))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_writes_lists_changed_in_place(self):
+        """Test that save writes the lists changed without setting them,
+        before and after the object is reloaded"""
+        storage = FileStorage()
+        place = Place(name="Listed")
+        storage.new(place)
+        storage.save()
+        key = "Place." + place.id
+        place.amenity_ids.append("a1")
+        storage.save()
+        with open("file.json", "r") as f:
+            self.assertEqual(json.load(f)[key]["amenity_ids"], ["a1"])
+        del FileStorage._FileStorage__objects[key]
+        del FileStorage._FileStorage__records[key]
+        FileStorage._FileStorage__stamp = None
+        storage.reload()
+        place = storage.get(Place, place.id)
+        place.amenity_ids.remove("a1")
+        storage.save()
+        with open("file.json", "r") as f:
+            self.assertEqual(json.load(f)[key]["amenity_ids"], [])
+        changes = [lambda ids: ids.extend(["a3", "a2"]),
+                   lambda ids: ids.sort(),
+                   lambda ids: ids.__setitem__(0, "a4"),
+                   lambda ids: ids.__delitem__(1),
+                   lambda ids: ids.insert(0, "a1"),
+                   lambda ids: ids.pop()]
+        expected = [["a3", "a2"], ["a2", "a3"], ["a4", "a3"], ["a4"],
+                    ["a1", "a4"], ["a1"]]
+        for change, ids in zip(changes, expected):
+            change(place.amenity_ids)
+            storage.save()
+            with open("file.json", "r") as f:
+                self.assertEqual(json.load(f)[key]["amenity_ids"], ids)
+        place.amenity_ids += ["a5"]
+        other = Place(amenity_ids=place.amenity_ids)
+        other.amenity_ids.append("a6")
+        storage.save()
+        with open("file.json", "r") as f:
+            self.assertEqual(json.load(f)[key]["amenity_ids"], ["a1", "a5"])
+        storage.delete(place)
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_skips_unchanged_file(self):
+        """Test that reload does not rebuild objects if file.json is as
+        it was last saved"""
+        storage = FileStorage()
+        state = State(name="Texas")
+        storage.new(state)
+        storage.save()
+        storage.reload()
+        self.assertIs(storage.all()["State." + state.id], state)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_merges_changed_records(self):
+        """Test that reload only rebuilds the records changed on disk"""
+        storage = FileStorage()
+        kept = State(name="Kept")
+        changed = State(name="Changed")
+        removed = State(name="Removed")
+        for state in (kept, changed, removed):
+            storage.new(state)
+        storage.save()
+        with open("file.json", "r") as f:
+            jo = json.load(f)
+        jo["State." + changed.id]["name"] = "Changed on disk"
+        del jo["State." + removed.id]
+        with open("file.json", "w") as f:
+            json.dump(jo, f)
+        storage.reload()
+        objs = storage.all()
+        self.assertIs(objs["State." + kept.id], kept)
+        self.assertEqual(objs["State." + changed.id].name, "Changed on disk")
+        self.assertNotIn("State." + removed.id, objs)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_detects_format(self):
+        """Test that reload reads file.json whatever format it was saved in"""
+        storage = FileStorage()
+        state = State(name="Packed")
+        storage.new(state)
+        key = "State." + state.id
+        FileStorage._FileStorage__format = "marshal.gz"
+        try:
+            storage.save()
+        finally:
+            FileStorage._FileStorage__format = "json"
+        del FileStorage._FileStorage__objects[key]
+        FileStorage._FileStorage__records = {}
+        FileStorage._FileStorage__stamp = None
+        storage.reload()
+        self.assertEqual(storage.all()[key].to_dict(), state.to_dict())
+        storage.save()
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageJournal(unittest.TestCase):
+    """Test the journal mode of the FileStorage class"""
+    journal = "file.json.journal"
+
+    def setUp(self):
+        """Switch FileStorage to journal mode"""
+        self.storage = FileStorage()
+        self.storage.save()
+        FileStorage._FileStorage__journal = True
+
+    def tearDown(self):
+        """Switch FileStorage back to rewriting file.json"""
+        FileStorage._FileStorage__journal = False
+        self.storage.save()
+
+    def read_journal(self):
+        """Return the entries of the journal"""
+        with open(self.journal, "r") as f:
+            return [json.loads(line) for line in f]
+
+    def test_save_appends_changed_records(self):
+        """Test that save only appends the changed records to the journal"""
+        with open("file.json", "r") as f:
+            snapshot = f.read()
+        state = State(name="Journal")
+        self.storage.new(state)
+        self.storage.save()
+        key = "State." + state.id
+        self.assertEqual(self.read_journal(), [[key, state.to_dict(1)]])
+        self.storage.delete(state)
+        self.storage.save()
+        self.assertEqual(self.read_journal()[-1], [key, None])
+        with open("file.json", "r") as f:
+            self.assertEqual(f.read(), snapshot)
+
+    def test_reload_replays_journal(self):
+        """Test that reload applies the journal on top of file.json"""
+        state = State(name="Replayed")
+        self.storage.new(state)
+        self.storage.save()
+        key = "State." + state.id
+        del FileStorage._FileStorage__objects[key]
+        FileStorage._FileStorage__records = {}
+        FileStorage._FileStorage__stamp = None
+        self.storage.reload()
+        self.assertEqual(self.storage.all()[key].name, "Replayed")
+
+    def test_compact(self):
+        """Test that compact folds the journal back into file.json"""
+        state = State(name="Compacted")
+        self.storage.new(state)
+        self.storage.save()
+        self.storage.compact()
+        self.assertEqual(os.path.getsize(self.journal), 0)
+        with open("file.json", "r") as f:
+            jo = json.load(f)
+        self.assertEqual(jo["State." + state.id]["name"], "Compacted")
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageLazy(unittest.TestCase):
+    """Test the lazy mode of the FileStorage class"""
+
+    def setUp(self):
+        """Save two states, then reload them lazily"""
+        self.storage = FileStorage()
+        self.states = [State(name="Lazy"), State(name="Idle")]
+        for state in self.states:
+            self.storage.new(state)
+        self.storage.save()
+        FileStorage._FileStorage__lazy = True
+        for state in self.states:
+            key = "State." + state.id
+            del FileStorage._FileStorage__objects[key]
+            del FileStorage._FileStorage__records[key]
+        FileStorage._FileStorage__stamp = None
+        self.storage.reload()
+        self.objects = FileStorage._FileStorage__objects
+
+    def tearDown(self):
+        """Switch FileStorage back to building every object"""
+        FileStorage._FileStorage__lazy = False
+        self.storage.all()
+
+    def test_count_does_not_build(self):
+        """Test that count counts records without building them"""
+        before = len(self.objects)
+        self.assertEqual(self.storage.count(), before + 2)
+        self.assertGreaterEqual(self.storage.count(State), 2)
+        self.assertEqual(len(self.objects), before)
+
+    def test_get_builds_one(self):
+        """Test that get only builds the object asked for"""
+        lazy, idle = self.states
+        state = self.storage.get(State, lazy.id)
+        self.assertIsNot(state, lazy)
+        self.assertEqual(state.name, "Lazy")
+        self.assertIn("State." + lazy.id, self.objects)
+        self.assertNotIn("State." + idle.id, self.objects)
+
+    def test_all_builds_class(self):
+        """Test that all(cls) builds the objects of cls"""
+        states = self.storage.all(State)
+        for state in self.states:
+            self.assertEqual(states["State." + state.id].name, state.name)
+
+    def test_page_builds_page(self):
+        """Test that a page only builds the objects it holds"""
+        first = min(self.states, key=lambda state: state.id)
+        page = self.storage.all(State, limit=1, after=first.id)
+        self.assertEqual(len(page), 1)
+        self.assertIn(list(page)[0], self.objects)
+        self.assertNotIn("State." + first.id, self.objects)
+
+    def test_iter_does_not_build(self):
+        """Test that iter yields the records without storing their objects,
+        and the objects already built as they are stored"""
+        lazy, idle = self.states
+        built = self.storage.get(State, lazy.id)
+        before = len(self.objects)
+        objs = {state.id: state for state in self.storage.iter(State)}
+        self.assertIs(objs[lazy.id], built)
+        self.assertEqual(objs[idle.id].name, "Idle")
+        self.assertEqual(len(self.objects), before)
+
+    def test_find_builds_related(self):
+        """Test that the foreign key indexes cover the records not built"""
+        lazy, idle = self.states
+        city = City(name="Austin", state_id=lazy.id)
+        self.storage.new(city)
+        self.storage.save()
+        key = "City." + city.id
+        del FileStorage._FileStorage__objects[key]
+        del FileStorage._FileStorage__records[key]
+        FileStorage._FileStorage__stamp = None
+        self.storage.reload()
+        self.assertNotIn(key, self.objects)
+        cities = self.storage.find(City, "state_id", lazy.id)
+        self.assertEqual([c.name for c in cities], ["Austin"])
+        self.assertIn(key, self.objects)
+        self.assertNotIn("State." + idle.id, self.objects)
+        self.storage.delete(cities[0])
+        self.storage.save()
+
+    def test_save_keeps_unbuilt_records(self):
+        """Test that save writes the records that were never built"""
+        self.storage.save()
+        with open("file.json", "r") as f:
+            jo = json.load(f)
+        for state in self.states:
+            self.assertEqual(jo["State." + state.id]["name"], state.name)
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageShards(unittest.TestCase):
+    """Test the sharded mode of the FileStorage class"""
+    shards = "file_storage_shards.tmp"
+
+    def setUp(self):
+        """Switch FileStorage to one file per class"""
+        self.storage = FileStorage()
+        self.state = State(name="Sharded")
+        self.storage.new(self.state)
+        self.storage.new(City(name="Sharded", state_id=self.state.id))
+        FileStorage._FileStorage__shards = self.shards
+        self.storage.save()
+
+    def tearDown(self):
+        """Switch FileStorage back to file.json"""
+        self.reset_pool("thread")
+        FileStorage._FileStorage__shards = None
+        shutil.rmtree(self.shards)
+        self.storage.save()
+
+    def test_save_writes_shards(self):
+        """Test that save writes one file per class"""
+        for name in ("State", "City"):
+            with open(os.path.join(self.shards, name + ".json"), "r") as f:
+                jo = json.load(f)
+            self.assertTrue(jo)
+            for key, record in jo.items():
+                self.assertEqual(record["__class__"], name)
+
+    def test_save_rewrites_dirty_shards(self):
+        """Test that save only rewrites the shards of changed classes"""
+        inodes = {}
+        for name in ("State", "City"):
+            path = os.path.join(self.shards, name + ".json")
+            inodes[name] = os.stat(path).st_ino
+        self.state.name = "Renamed"
+        self.storage.save()
+        path = os.path.join(self.shards, "State.json")
+        self.assertNotEqual(os.stat(path).st_ino, inodes["State"])
+        path = os.path.join(self.shards, "City.json")
+        self.assertEqual(os.stat(path).st_ino, inodes["City"])
+
+    def test_save_names_shards_by_format(self):
+        """Test that the shards are named after the format they are in"""
+        FileStorage._FileStorage__format = "marshal.gz"
+        try:
+            self.state.name = "Packed"
+            self.storage.save()
+        finally:
+            FileStorage._FileStorage__format = "json"
+        names = os.listdir(self.shards)
+        self.assertIn("State.marshal.gz", names)
+        self.assertNotIn("State.json", names)
+        key = "State." + self.state.id
+        del FileStorage._FileStorage__objects[key]
+        FileStorage._FileStorage__records = {}
+        FileStorage._FileStorage__stamp = None
+        self.storage.reload()
+        self.assertEqual(self.storage.all()[key].name, "Packed")
+
+    def reset_pool(self, kind):
+        """Shut the pool reading the shards down, the next one being of
+        kind"""
+        if FileStorage._FileStorage__pool is not None:
+            FileStorage._FileStorage__pool.shutdown(wait=True)
+            FileStorage._FileStorage__pool = None
+        FileStorage._FileStorage__pool_kind = kind
+
+    def test_reload_reads_shards(self):
+        """Test that reload reads the shards with either kind of pool"""
+        key = "State." + self.state.id
+        for kind in ("thread", "process"):
+            with self.subTest(kind=kind):
+                self.reset_pool(kind)
+                del FileStorage._FileStorage__objects[key]
+                FileStorage._FileStorage__records = {}
+                FileStorage._FileStorage__stamp = None
+                self.storage.reload()
+                self.assertEqual(self.storage.all()[key].name, "Sharded")
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageBatch(unittest.TestCase):
+    """Test that the FileStorage class coalesces saves"""
+
+    def setUp(self):
+        """Set up a storage with nothing left to save"""
+        self.storage = FileStorage()
+        self.storage.save()
+
+    def tearDown(self):
+        """Turn the flush window off"""
+        FileStorage._FileStorage__flush_window = 0
+        self.storage.flush()
+
+    def saved(self, obj):
+        """Return whether obj is in file.json"""
+        with open("file.json", "r") as f:
+            return obj.__class__.__name__ + "." + obj.id in json.load(f)
+
+    def test_batch(self):
+        """Test that saves made in a batch are written at its end"""
+        states = []
+        with self.storage.batch():
+            for i in range(3):
+                states.append(State(name="Batch {}".format(i)))
+                states[-1].save()
+                self.assertFalse(self.saved(states[-1]))
+            with self.storage.batch():
+                State(name="Nested").save()
+            self.assertFalse(self.saved(states[0]))
+        for state in states:
+            self.assertTrue(self.saved(state))
+
+    def test_batch_rollback(self):
+        """Test that a batch that raises writes nothing and puts the objects
+        it changed back as they were last saved"""
+        kept = State(name="Kept")
+        kept.save()
+        added = State(name="Added")
+        with self.assertRaises(ValueError):
+            with self.storage.batch():
+                added.save()
+                kept.name = "Renamed"
+                kept.save()
+                raise ValueError
+        self.assertIsNone(self.storage.get(State, added.id))
+        self.assertEqual(self.storage.get(State, kept.id).name, "Kept")
+        self.storage.save()
+        self.assertFalse(self.saved(added))
+        with open("file.json", "r") as f:
+            self.assertEqual(json.load(f)["State." + kept.id]["name"], "Kept")
+
+    def test_batch_per_thread(self):
+        """Test that a batch only defers the saves of its own thread"""
+        started, done = threading.Event(), threading.Event()
+
+        def batched():
+            """waits in a batch until done is set"""
+            with self.storage.batch():
+                started.set()
+                done.wait()
+        thread = threading.Thread(target=batched)
+        thread.start()
+        try:
+            started.wait()
+            state = State(name="Unbatched")
+            state.save()
+            self.assertTrue(self.saved(state))
+        finally:
+            done.set()
+            thread.join()
+
+    def test_flush_window(self):
+        """Test that saves made in the flush window are written together"""
+        FileStorage._FileStorage__flush_window = 60
+        state = State(name="Windowed")
+        state.save()
+        self.assertFalse(self.saved(state))
+        self.storage.flush()
+        self.assertTrue(self.saved(state))
+
+    def test_flush_timer(self):
+        """Test that the flush window ends on its own"""
+        FileStorage._FileStorage__flush_window = 0.05
+        state = State(name="Timed")
+        state.save()
+        flusher = FileStorage._FileStorage__flusher
+        self.assertFalse(self.saved(state))
+        flusher.join()
+        self.assertTrue(self.saved(state))
+
+    def test_save_while_flushing(self):
+        """Test that objects added, changed and deleted by other threads
+        while the flusher writes are all written"""
+        FileStorage._FileStorage__flush_window = 0.001
+        gone = [State(name="Gone") for _ in range(3)]
+        self.storage.bulk_new(gone)
+        states = [[] for _ in range(3)]
+        errors = []
+
+        def save(k):
+            """saves, renames and deletes states while the flusher runs"""
+            try:
+                for i in range(100):
+                    state = State(name="Flushed")
+                    state.save()
+                    state.name = "Renamed {}".format(i)
+                    states[k].append(state)
+                    state.save()
+                self.storage.delete(gone[k])
+                self.storage.save()
+            except Exception as e:
+                errors.append(e)
+        threads = [threading.Thread(target=save, args=(k,)) for k in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.storage.flush()
+        self.assertEqual(errors, [])
+        with open("file.json", "r") as f:
+            records = json.load(f)
+        for k in range(3):
+            self.assertNotIn("State." + gone[k].id, records)
+            for i, state in enumerate(states[k]):
+                self.assertEqual(records["State." + state.id]["name"],
+                                 "Renamed {}".format(i))
+        for state in sum(states, []):
+            self.storage.delete(state)
+
+    def test_failed_write_keeps_changes(self):
+        """Test that the changes of a save or flush that fails are written
+        by the next one"""
+        state = State(name="Failed")
+        with mock.patch.object(file_storage.file_formats, "dump",
+                               side_effect=OSError):
+            with self.assertRaises(OSError):
+                state.save()
+        self.storage.save()
+        self.assertTrue(self.saved(state))
+        FileStorage._FileStorage__flush_window = 60
+        state.name = "Deferred"
+        state.save()
+        with mock.patch.object(file_storage.file_formats, "dump",
+                               side_effect=OSError):
+            with self.assertRaises(OSError):
+                self.storage.flush()
+        self.storage.flush()
+        with open("file.json", "r") as f:
+            self.assertEqual(json.load(f)["State." + state.id]["name"],
+                             "Deferred")
+        self.storage.delete(state)
+
+    def test_bulk_new(self):
+        """Test that bulk_new saves every object in a single write"""
+        states = [State(name="Bulk {}".format(i)) for i in range(3)]
+        write = FileStorage._FileStorage__write
+        with mock.patch.object(FileStorage, "_FileStorage__write",
+                               autospec=True, side_effect=write) as patched:
+            self.storage.bulk_new(states)
+        self.assertEqual(patched.call_count, 1)
+        for state in states:
+            self.assertTrue(self.saved(state))
+
+
+def save_states(name, n):
+    """Save n states called name, one at a time"""
+    for i in range(n):
+        State(name=name).save()
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageProcesses(unittest.TestCase):
+    """Test the FileStorage class shared by several processes"""
+
+    def test_no_lost_updates(self):
+        """Test that processes saving at the same time keep every object"""
+        storage = FileStorage()
+        storage.save()
+        context = multiprocessing.get_context("fork")
+        names = ["Process {} {}".format(i, os.getpid()) for i in range(3)]
+        procs = [context.Process(target=save_states, args=(name, 10))
+                 for name in names]
+        for proc in procs:
+            proc.start()
+        save_states("Parent {}".format(os.getpid()), 10)
+        for proc in procs:
+            proc.join()
+        storage.reload()
+        saved = [state.name for state in storage.all(State).values()]
+        for name in names + ["Parent {}".format(os.getpid())]:
+            self.assertEqual(saved.count(name), 10)
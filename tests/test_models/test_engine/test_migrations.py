@@ -0,0 +1,125 @@
+#!/usr/bin/python3
+"""
+Contains the TestMigrationsDocs and TestMigrations classes
+"""
+
+import inspect
+import models
+from models.base_model import Base
+from models.engine import migrations
+import multiprocessing
+import os
+import pep8
+import sqlalchemy
+import tempfile
+import unittest
+
+
+class TestMigrationsDocs(unittest.TestCase):
+    """Tests to check the documentation and style of migrations"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.mig_f = inspect.getmembers(migrations, inspect.isfunction)
+
+    def test_pep8_conformance_migrations(self):
+        """Test that models/engine/migrations.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/migrations.py',
+                                    'tests/test_models/test_engine/\
+test_migrations.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_migrations_module_docstring(self):
+        """Test for the migrations.py module docstring"""
+        self.assertIsNot(migrations.__doc__, None,
+                         "migrations.py needs a docstring")
+        self.assertTrue(len(migrations.__doc__) >= 1,
+                        "migrations.py needs a docstring")
+
+    def test_mig_func_docstrings(self):
+        """Test for the presence of docstrings in migrations functions"""
+        for func in self.mig_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} function needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} function needs a docstring".format(func[0]))
+
+
+@unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+class TestMigrations(unittest.TestCase):
+    """Test the migrations of the database schema"""
+
+    def setUp(self):
+        """Set up a database created before the schema had a version"""
+        self.tmp = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmp.name, "old.db")
+        self.engine = sqlalchemy.create_engine("sqlite:///" + path)
+        metadata = Base.metadata
+        metadata.create_all(self.engine)
+        with self.engine.begin() as conn:
+            for table in metadata.sorted_tables:
+                for index in table.indexes:
+                    index.drop(conn)
+
+    def tearDown(self):
+        """Remove the database"""
+        self.engine.dispose()
+        self.tmp.cleanup()
+
+    def indexes(self):
+        """Return the names of the indexes of the database"""
+        inspector = sqlalchemy.inspect(self.engine)
+        return set(index["name"] for table in inspector.get_table_names()
+                   for index in inspector.get_indexes(table))
+
+    def test_upgrade(self):
+        """Test that upgrade creates the missing indexes and records the
+        version of the schema"""
+        self.assertNotIn("ix_places_city_id", self.indexes())
+        self.assertEqual(migrations.upgrade(self.engine),
+                         len(migrations.migrations))
+        self.assertIn("ix_places_city_id", self.indexes())
+        self.assertIn("ix_place_amenity_amenity_id", self.indexes())
+        with self.engine.connect() as conn:
+            rows = conn.execute(sqlalchemy.select(migrations.schema)).all()
+        self.assertEqual(rows, [(len(migrations.migrations),)])
+
+    def test_upgrade_frozen(self):
+        """Test that migration 1 creates the indexes of version 1, not the
+        ones the models declare since"""
+        users = Base.metadata.tables["users"]
+        index = sqlalchemy.Index("ix_users_later", users.c.first_name)
+        try:
+            migrations.upgrade(self.engine)
+        finally:
+            users.indexes.discard(index)
+        self.assertNotIn("ix_users_later", self.indexes())
+        self.assertEqual(set(name for table, name, columns
+                             in migrations.indexes_v1) - self.indexes(),
+                         set())
+
+    def test_upgrade_concurrent(self):
+        """Test that workers upgrading the database together record a
+        single version"""
+        self.engine.dispose()
+        context = multiprocessing.get_context("fork")
+        procs = [context.Process(target=migrations.upgrade,
+                                 args=(self.engine,)) for i in range(4)]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join()
+        self.assertEqual([proc.exitcode for proc in procs], [0] * 4)
+        with self.engine.connect() as conn:
+            rows = conn.execute(sqlalchemy.select(migrations.schema)).all()
+        self.assertEqual(rows, [(len(migrations.migrations),)])
+
+    def test_upgrade_once(self):
+        """Test that a database at the current version is left as it is"""
+        migrations.upgrade(self.engine)
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql("DROP INDEX ix_users_email")
+        migrations.upgrade(self.engine)
+        self.assertNotIn("ix_users_email", self.indexes())
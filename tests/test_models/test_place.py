@@ -168,7 +168,7 @@ class TestPlace(unittest.TestCase):
         """Test Place has attr amenity_ids, and it's an empty list"""
         place = Place()
         self.assertTrue(hasattr(place, "amenity_ids"))
-        self.assertEqual(type(place.amenity_ids), list)
+        self.assertIsInstance(place.amenity_ids, list)
         self.assertEqual(len(place.amenity_ids), 0)
 
     def test_to_dict_creates_dict(self):